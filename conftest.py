@@ -0,0 +1,21 @@
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    # Отдельная база-«реплика»: тесты маршрутизации видят, откуда читали
+    replica = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    settings.DATABASES["replica"] = connections.configure_settings(
+        {"default": settings.DATABASES["default"], "replica": replica}
+    )["replica"]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Откат транзакции в тестах не вызывает сигналы инвалидации
+    cache.clear()
+    yield
+    cache.clear()
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+# Настройки соединений и потока событий зависят от обработчика
+os.environ["DJANGO_ASGI"] = "True"
 
 application = get_asgi_application()
@@ -0,0 +1,183 @@
+"""
+Throughput of the sync and async task pages under concurrent clients.
+
+Requests go straight to the project's entry points: the WSGI application is
+called from a pool of threads, one per client, like a threaded WSGI worker;
+the ASGI application gets one asyncio task per client on a single event
+loop, like one uvicorn worker. Sync clients request ``tasks_list`` /
+``task_detail``, async clients the ``*_async`` views with the same content.
+The async views run their queries one after another like the sync ones, so
+the report compares how many requests a worker serves while others wait on
+the database, not the latency of a single page.
+
+Under ASGI every request runs its ORM calls in its own thread, so use
+``DB_CONN_MAX_AGE=0`` or ``DB_POOL=True`` when measuring against Postgres:
+persistent connections of finished request threads are not reused.
+"""
+
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from task_manager.asgi import application as asgi_application
+from task_manager.tasks.models import Task
+from task_manager.wsgi import application as wsgi_application
+
+from .harness import percentile
+
+PAGES = {
+    "tasks_list": ("tasks_list", "tasks_list_async"),
+    "task_detail": ("task_detail", "task_detail_async"),
+}
+
+
+def session_cookie(user):
+    client = Client()
+    client.force_login(user)
+    name = settings.SESSION_COOKIE_NAME
+    return f"{name}={client.cookies[name].value}"
+
+
+def wsgi_get(application, path, cookie):
+    environ = {}
+    setup_testing_defaults(environ)
+    environ.update(
+        PATH_INFO=path, HTTP_COOKIE=cookie, **{"wsgi.input": io.BytesIO()}
+    )
+    statuses = []
+
+    def start_response(status, headers, exc_info=None):
+        statuses.append(int(status.split()[0]))
+
+    result = application(environ, start_response)
+    try:
+        for _ in result:
+            pass
+    finally:
+        result.close()
+    return statuses[0]
+
+
+async def asgi_get(application, path, cookie):
+    finished = asyncio.Event()
+    pending = [{"type": "http.request", "body": b"", "more_body": False}]
+    statuses = []
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        # Django слушает разрыв соединения, пока строит ответ
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+        elif not message.get("more_body"):
+            finished.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    try:
+        await application(scope, receive, send)
+    finally:
+        finished.set()
+    return statuses[0]
+
+
+def _check(status, path):
+    if status != 200:
+        raise RuntimeError(f"HTTP {status} for {path}")
+
+
+def summarize(latencies, elapsed):
+    flat = [value for client in latencies for value in client]
+    return {
+        "requests": len(flat),
+        "rps": round(len(flat) / elapsed, 1),
+        "p50_ms": round(percentile(flat, 0.50), 2),
+        "p95_ms": round(percentile(flat, 0.95), 2),
+    }
+
+
+def run_sync(path, cookie, clients, requests):
+    def client():
+        latencies = []
+        try:
+            for _ in range(requests):
+                started = time.perf_counter()
+                _check(wsgi_get(wsgi_application, path, cookie), path)
+                latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            connections.close_all()
+        return latencies
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        futures = [pool.submit(client) for _ in range(clients)]
+        latencies = [future.result() for future in futures]
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run_async(path, cookie, clients, requests):
+    async def client():
+        latencies = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            _check(await asgi_get(asgi_application, path, cookie), path)
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(client() for _ in range(clients)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def run(user, clients=8, requests=20, report=None):
+    task = Task.objects.filter(author=user).order_by("-id").first()
+    if task is None:
+        raise RuntimeError("The user has no tasks: run seed_benchmark_data")
+    cookie = session_cookie(user)
+
+    results = {}
+    for page, (sync_name, async_name) in PAGES.items():
+        kwargs = {"pk": task.pk} if page == "task_detail" else {}
+        results[page] = {
+            "sync": run_sync(
+                reverse(sync_name, kwargs=kwargs), cookie, clients, requests
+            ),
+            "async": asyncio.run(
+                run_async(
+                    reverse(async_name, kwargs=kwargs),
+                    cookie,
+                    clients,
+                    requests,
+                )
+            ),
+        }
+        if report:
+            report(page, results[page])
+    return {
+        "database": connections["default"].vendor,
+        "clients": clients,
+        "pages": results,
+    }
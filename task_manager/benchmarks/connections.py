@@ -0,0 +1,75 @@
+"""
+Cost of getting a database connection per request.
+
+Every mode replays Django's request cycle on a fresh connection wrapper:
+``close_if_unusable_or_obsolete`` on request start, one ``SELECT 1``, and
+the same call on request finish. With ``CONN_MAX_AGE = 0`` that opens and
+closes a connection per request; persistent connections keep it; the pool
+(Postgres with psycopg_pool only) hands out a warm one.
+"""
+
+import copy
+import importlib.util
+import statistics
+import time
+
+from django.db import connections
+from django.db.utils import load_backend
+
+from .harness import percentile
+
+
+def _wrapper(alias, mode):
+    settings_dict = copy.deepcopy(connections.settings[alias])
+    settings_dict["CONN_HEALTH_CHECKS"] = mode == "persistent"
+    settings_dict["CONN_MAX_AGE"] = 600 if mode == "persistent" else 0
+    options = settings_dict.setdefault("OPTIONS", {})
+    options.pop("pool", None)
+    if mode == "pool":
+        options["pool"] = {"min_size": 1, "max_size": 2}
+    backend = load_backend(settings_dict["ENGINE"])
+    return backend.DatabaseWrapper(settings_dict, f"{alias}_{mode}")
+
+
+def available_modes(alias="default"):
+    modes = ["new_connection", "persistent"]
+    if (
+        connections[alias].vendor == "postgresql"
+        and importlib.util.find_spec("psycopg_pool") is not None
+    ):
+        modes.append("pool")
+    return modes
+
+
+def measure(alias, mode, requests):
+    connection = _wrapper(alias, mode)
+    latencies = []
+    try:
+        for _ in range(requests):
+            started = time.perf_counter()
+            connection.close_if_unusable_or_obsolete()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            connection.close_if_unusable_or_obsolete()
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        connection.close()
+        if mode == "pool":
+            connection.close_pool()
+    return {
+        "requests": requests,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+    }
+
+
+def run(alias="default", requests=200):
+    return {
+        "database": connections[alias].vendor,
+        "modes": {
+            mode: measure(alias, mode, requests)
+            for mode in available_modes(alias)
+        },
+    }
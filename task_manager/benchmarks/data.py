@@ -0,0 +1,136 @@
+"""
+Synthetic data for benchmarks.
+
+Executors and labels follow a Zipf-like distribution: a few people and
+labels carry most of the tasks, like in a real tracker. Tasks are written
+through the bulk importer, so seeding uses COPY on Postgres.
+"""
+
+import random
+import re
+
+from django.contrib.auth import get_user_model
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.importer import TaskImporter, chunked
+
+User = get_user_model()
+
+USER_PREFIX = "bench_user_"
+LABEL_PREFIX = "bench_label_"
+
+STATUS_WEIGHTS = {
+    "bench_new": 30,
+    "bench_in_progress": 20,
+    "bench_review": 10,
+    "bench_done": 40,
+}
+
+WORDS = [
+    "deploy",
+    "backend",
+    "frontend",
+    "release",
+    "database",
+    "migration",
+    "login",
+    "search",
+    "report",
+    "export",
+    "import",
+    "cache",
+    "index",
+    "query",
+    "page",
+    "form",
+    "button",
+    "layout",
+    "email",
+    "notify",
+    "invoice",
+    "payment",
+    "profile",
+    "settings",
+    "api",
+    "docs",
+    "test",
+    "bug",
+]
+
+SIZE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)([kKmM]?)$")
+
+
+def parse_size(value):
+    """'10k' -> 10000, '1M' -> 1000000."""
+    match = SIZE_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    number, suffix = match.groups()
+    multiplier = {"": 1, "k": 1_000, "m": 1_000_000}[suffix.lower()]
+    return int(float(number) * multiplier)
+
+
+def zipf_weights(count, exponent=1.1):
+    return [1 / (rank**exponent) for rank in range(1, count + 1)]
+
+
+def ensure_reference_data(users, labels):
+    for name in STATUS_WEIGHTS:
+        Status.objects.get_or_create(name=name)
+    User.objects.bulk_create(
+        [User(username=f"{USER_PREFIX}{index}") for index in range(users)],
+        ignore_conflicts=True,
+    )
+    Label.objects.bulk_create(
+        [Label(name=f"{LABEL_PREFIX}{index}") for index in range(labels)],
+        ignore_conflicts=True,
+    )
+
+
+def generate_records(
+    count,
+    users,
+    labels,
+    rng,
+    unassigned_share=0.15,
+    max_labels=3,
+):
+    usernames = [f"{USER_PREFIX}{index}" for index in range(users)]
+    label_names = [f"{LABEL_PREFIX}{index}" for index in range(labels)]
+    user_weights = zipf_weights(users)
+    label_weights = zipf_weights(labels)
+    statuses = list(STATUS_WEIGHTS)
+    status_weights = list(STATUS_WEIGHTS.values())
+
+    for index in range(count):
+        executor = ""
+        if rng.random() >= unassigned_share:
+            executor = rng.choices(usernames, user_weights)[0]
+        label_count = rng.randint(0, max_labels)
+        yield {
+            "name": f"Task {index} {' '.join(rng.sample(WORDS, 3))}",
+            "description": " ".join(rng.choices(WORDS, k=12)),
+            "status": rng.choices(statuses, status_weights)[0],
+            "author": rng.choices(usernames, user_weights)[0],
+            "executor": executor,
+            "labels": sorted(
+                set(rng.choices(label_names, label_weights, k=label_count))
+            ),
+        }
+
+
+def seed(
+    tasks, users=200, labels=30, batch_size=5000, random_seed=42, report=None
+):
+    rng = random.Random(random_seed)
+    ensure_reference_data(users, labels)
+    importer = TaskImporter()
+
+    created = 0
+    records = generate_records(tasks, users, labels, rng)
+    for chunk in chunked(records, batch_size):
+        created += importer.import_chunk(chunk, first_number=created).created
+        if report:
+            report(created)
+    return created
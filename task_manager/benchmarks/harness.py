@@ -0,0 +1,212 @@
+"""
+Latency benchmark harness.
+
+Every scenario issues requests through the Django test client against the
+configured database and records latency percentiles, SQL query counts and
+the peak Python memory of one extra traced request (tracing is kept out of
+the timed runs, since tracemalloc slows everything down).
+"""
+
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+import django
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.benchmarks.data import LABEL_PREFIX, USER_PREFIX
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.tasks.query_plans import filter_combinations
+
+BENCH_TASK_NAME = "Benchmark created task"
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(share * len(ordered)) - 1))
+    return ordered[index]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Scenario:
+    def __init__(self, name, method, url, data=None):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.data = data
+
+    def request(self, client):
+        if self.method == "post":
+            response = client.post(self.url, self.data)
+        else:
+            response = client.get(self.url, self.data)
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f"{self.name}: HTTP {response.status_code} for {self.url}"
+            )
+        return response
+
+
+class BenchmarkRunner:
+    def __init__(self, iterations=20, warmup=2, client=None):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.client = client or Client(HTTP_HOST="localhost")
+
+    def login(self, user):
+        self.client.force_login(user)
+
+    def measure(self, scenario):
+        for _ in range(self.warmup):
+            scenario.request(self.client)
+
+        latencies, queries = [], []
+        for _ in range(self.iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                scenario.request(self.client)
+                latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured.captured_queries))
+
+        tracemalloc.start()
+        try:
+            scenario.request(self.client)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "iterations": self.iterations,
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "mean_ms": round(statistics.fmean(latencies), 2),
+            "queries": max(queries),
+            "peak_memory_kb": round(peak / 1024, 1),
+        }
+
+
+def build_scenarios(user):
+    status = Status.objects.filter(name__startswith="bench_").first()
+    executor = user.__class__.objects.filter(
+        username__startswith=USER_PREFIX
+    ).first()
+    label = Label.objects.filter(name__startswith=LABEL_PREFIX).first()
+    task = Task.objects.filter(author=user).order_by("-id").first()
+    if not (status and executor and label and task):
+        raise RuntimeError("No benchmark data: run seed_benchmark_data first")
+
+    values = {
+        "status": status.pk,
+        "executor": executor.pk,
+        "label": label.pk,
+        "self_tasks": "on",
+        "q": "deploy",
+    }
+    scenarios = []
+    for names in filter_combinations():
+        name = "+".join(names) or "all"
+        scenarios.append(
+            Scenario(
+                f"tasks_list[{name}]",
+                "get",
+                reverse("tasks_list"),
+                {key: values[key] for key in names},
+            )
+        )
+
+    form = {
+        "name": task.name,
+        "description": task.description,
+        "status": task.status_id,
+        "executor": task.executor_id or "",
+        "labels": list(task.labels.values_list("pk", flat=True)),
+    }
+    scenarios += [
+        Scenario(
+            "task_detail",
+            "get",
+            reverse("task_detail", kwargs={"pk": task.pk}),
+        ),
+        Scenario(
+            "task_create",
+            "post",
+            reverse("task_create"),
+            {**form, "name": BENCH_TASK_NAME},
+        ),
+        Scenario(
+            "task_update",
+            "post",
+            reverse("task_update", kwargs={"pk": task.pk}),
+            form,
+        ),
+    ]
+    return scenarios
+
+
+def run(user, iterations=20, warmup=2, only=None, report=None):
+    runner = BenchmarkRunner(iterations=iterations, warmup=warmup)
+    runner.login(user)
+
+    results = {}
+    try:
+        for scenario in build_scenarios(user):
+            if only and not any(part in scenario.name for part in only):
+                continue
+            results[scenario.name] = runner.measure(scenario)
+            if report:
+                report(scenario.name, results[scenario.name])
+    finally:
+        Task.objects.filter(name=BENCH_TASK_NAME).delete()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat(),
+            "database": connection.vendor,
+            "tasks": Task.objects.count(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(report, baseline):
+    """Rows of (scenario, metric, baseline, current, ratio)."""
+    rows = []
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms", "queries", "peak_memory_kb"):
+            before, after = previous[metric], current[metric]
+            ratio = after / before if before else None
+            rows.append((name, metric, before, after, ratio))
+    return rows
+
+
+def write_report(report, path):
+    with open(path, "w", encoding="utf-8") as target:
+        json.dump(report, target, indent=2)
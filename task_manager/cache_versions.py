@@ -0,0 +1,40 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = "version"
+
+
+def _key(namespace):
+    return f"{KEY_PREFIX}:{namespace}"
+
+
+def is_shared():
+    """
+    Whether version bumps reach every worker.
+
+    With a per-process cache a bump stays in the worker that made it, so
+    callers skip caching instead of serving stale entries elsewhere.
+    """
+    return settings.SHARED_CACHE
+
+
+def get_version(namespace):
+    """
+    Current version token of a namespace.
+
+    Cached entries are keyed by this token, so bumping it invalidates all of
+    them at once in every worker that shares the cache.
+    """
+    version = cache.get(_key(namespace))
+    if version is None:
+        cache.add(_key(namespace), uuid.uuid4().hex, None)
+        version = cache.get(_key(namespace))
+    return version
+
+
+def bump_version(namespace):
+    version = uuid.uuid4().hex
+    cache.set(_key(namespace), version, None)
+    return version
@@ -0,0 +1,73 @@
+"""
+Conditional GET for class-based views.
+
+A view lists the values its page depends on; the mixin hashes them into an
+ETag and answers ``If-None-Match`` / ``If-Modified-Since`` with 304 before
+the page is built, the same way ``django.views.decorators.http.condition``
+does for function views.
+"""
+
+import hashlib
+
+from django.contrib import messages
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+
+
+def has_pending_messages(request):
+    # Сообщения показываются один раз — такую страницу рендерим всегда
+    return bool(len(messages.get_messages(request)))
+
+
+class ConditionalGetMixin:
+    def get_validator_parts(self):
+        """
+        Return (values the page depends on, last modified datetime), or
+        None to build the page unconditionally.
+        """
+        return None
+
+    def get_validators(self):
+        return self.build_validators(self.get_validator_parts())
+
+    def build_validators(self, validator_parts):
+        if validator_parts is None:
+            return None, None
+        parts, last_modified = validator_parts
+        parts = [
+            *parts,
+            self.request.user.pk,
+            get_language(),
+            self.request.get_full_path(),
+        ]
+        etag = hashlib.md5(
+            "|".join(map(str, parts)).encode(), usedforsecurity=False
+        ).hexdigest()
+        if last_modified is not None:
+            last_modified = int(last_modified.timestamp())
+        return quote_etag(etag), last_modified
+
+    def get(self, request, *args, **kwargs):
+        if has_pending_messages(request):
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators()
+        if etag is None:
+            return super().get(request, *args, **kwargs)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.patch_validators(response, etag, last_modified)
+
+    def patch_validators(self, response, etag, last_modified):
+        if last_modified is not None:
+            response.headers.setdefault(
+                "Last-Modified", http_date(last_modified)
+            )
+        response.headers.setdefault("ETag", etag)
+        # Страница зависит от пользователя: только приватный кэш с проверкой
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
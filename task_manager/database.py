@@ -0,0 +1,81 @@
+"""
+DATABASES entries built from environment variables.
+
+By default connections are persistent: a gunicorn worker keeps its
+connection for ``DB_CONN_MAX_AGE`` seconds and Django checks it with a
+health check before reusing it after an error. With ``DB_POOL=True`` (Postgres
+only, needs ``psycopg[pool]``) the worker instead borrows connections from a
+psycopg pool and returns them at the end of every request; Django requires
+``CONN_MAX_AGE = 0`` in that mode. Under ASGI (``DJANGO_ASGI=True``, set by
+``task_manager.asgi``) the ORM runs in ``sync_to_async`` threads whose
+persistent connections are never closed, so there connections are opened
+per request unless the pool is on. Read replicas get the same settings.
+"""
+
+import importlib.util
+
+import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
+
+POSTGRES_ENGINE = "django.db.backends.postgresql"
+
+
+def _flag(env, name):
+    return env.get(name, "False") == "True"
+
+
+def _int(env, name, default):
+    try:
+        return int(env.get(name, default))
+    except ValueError as error:
+        raise ImproperlyConfigured(f"{name} must be an integer") from error
+
+
+def _conn_max_age(env, default):
+    if _flag(env, "DJANGO_ASGI"):
+        # close_old_connections не доходит до потоков sync_to_async
+        return 0
+    return _int(env, "DB_CONN_MAX_AGE", default)
+
+
+def database_settings(url, env, default_name):
+    if not url:
+        return {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": default_name,
+            "CONN_MAX_AGE": _conn_max_age(env, 0),
+            "CONN_HEALTH_CHECKS": True,
+        }
+
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=_conn_max_age(env, 600),
+        conn_health_checks=True,
+    )
+    if not _flag(env, "DB_POOL"):
+        return config
+
+    if config["ENGINE"] != POSTGRES_ENGINE:
+        raise ImproperlyConfigured("DB_POOL is supported only for Postgres")
+    if importlib.util.find_spec("psycopg_pool") is None:
+        raise ImproperlyConfigured("DB_POOL needs psycopg[pool] installed")
+
+    config["CONN_MAX_AGE"] = 0
+    config.setdefault("OPTIONS", {})["pool"] = {
+        "min_size": _int(env, "DB_POOL_MIN_SIZE", 2),
+        "max_size": _int(env, "DB_POOL_MAX_SIZE", 10),
+        "timeout": _int(env, "DB_POOL_TIMEOUT", 10),
+    }
+    return config
+
+
+def replica_settings(urls, env):
+    """``replica_1``, ``replica_2``... for comma-separated database URLs."""
+    replicas = {}
+    urls = [url.strip() for url in (urls or "").split(",") if url.strip()]
+    for number, url in enumerate(urls, start=1):
+        config = database_settings(url, env, "")
+        # В тестах реплика читает тестовую основную базу
+        config["TEST"] = {"MIRROR": "default"}
+        replicas[f"replica_{number}"] = config
+    return replicas
@@ -0,0 +1,110 @@
+"""
+Read replicas for the pages that only read.
+
+Views with ``read_from_replica = True`` (the task list and detail pages,
+the exports and the status, label and user lists) read from one of
+``settings.DATABASE_READ_REPLICAS``; every other view and every write uses
+``default``. A response to an unsafe method sets the short ``db_pin``
+cookie, and while the browser keeps it these pages read from ``default``
+as well: the user sees their own write before the replicas replay it.
+Sessions are always read from ``default``.
+
+The chosen alias lives in a per-request context variable, so the
+template rendering and the ORM threads of async views use it too.
+Streamed responses run after the middleware returns and have to bind
+their querysets with ``using(queryset.db)``.
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = "db_pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+_request_state = ContextVar("db_request_state", default=None)
+
+
+def read_alias():
+    """Replica chosen for the current request, or None for ``default``."""
+    state = _request_state.get()
+    return state.get("alias") if state else None
+
+
+def choose_replica(request):
+    replicas = settings.DATABASE_READ_REPLICAS
+    if not replicas or PIN_COOKIE in request.COOKIES:
+        return None
+    return random.choice(replicas)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == "sessions":
+            # Отстающая сессия разлогинила бы пользователя
+            return None
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        # Объект, прочитанный с реплики, сохраняется в основную базу
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики хранят те же строки, что и основная база
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_READ_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= aliases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = _request_state.set({})
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        token = _request_state.set({})
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self.pin(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        if getattr(view_class, "read_from_replica", False):
+            # Словарь общий для копий контекста в потоках sync_to_async
+            _request_state.get()["alias"] = choose_replica(request)
+
+    def pin(self, request, response):
+        if (
+            settings.DATABASE_READ_REPLICAS
+            and request.method not in SAFE_METHODS
+        ):
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# Индексы для istartswith, как в task_manager.prefix_search на момент миграции
+CREATE_SQL = {
+    "sqlite": (
+        'CREATE INDEX IF NOT EXISTS "label_name_prefix_idx" '
+        'ON "labels_label" ("name" COLLATE NOCASE)'
+    ),
+    "postgresql": (
+        'CREATE INDEX IF NOT EXISTS "label_name_prefix_idx" '
+        'ON "labels_label" (UPPER("name"::text) text_pattern_ops)'
+    ),
+}
+DROP_SQL = 'DROP INDEX IF EXISTS "label_name_prefix_idx"'
+
+
+def create_index(apps, schema_editor):
+    sql = CREATE_SQL.get(schema_editor.connection.vendor)
+    if sql:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_SQL:
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("labels", "0002_label_task_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
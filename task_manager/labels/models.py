@@ -8,6 +8,9 @@ class Label(models.Model):
         unique=True,
         verbose_name=_("Name"),
     )
+    # Поддерживаются task_manager.tasks.counters
+    tasks_count = models.IntegerField(default=0, editable=False)
+    open_tasks_count = models.IntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -6,6 +6,7 @@ from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
 from task_manager.labels.models import Label
+from task_manager.tasks.delete_impact import DeleteImpactMixin, label_impact
 
 from .forms import LabelForm
 
@@ -15,6 +16,7 @@ class LabelListView(LoginRequiredMixin, ListView):
     template_name = "task_manager/labels/labels.html"
     context_object_name = "labels"
     login_url = reverse_lazy("login")
+    read_from_replica = True
 
 
 class LabelCreateView(LoginRequiredMixin, CreateView):
@@ -43,12 +45,15 @@ class LabelUpdateView(LoginRequiredMixin, UpdateView):
         return response
 
 
-class LabelDeleteView(LoginRequiredMixin, DeleteView):
+class LabelDeleteView(LoginRequiredMixin, DeleteImpactMixin, DeleteView):
     model = Label
     template_name = "task_manager/labels/delete.html"
     success_url = reverse_lazy("labels_list")
     login_url = reverse_lazy("login")
 
+    def get_delete_impact(self):
+        return label_impact(self.object)
+
     def post(self, request, *args, **kwargs):
         try:
             response = super().post(request, *args, **kwargs)
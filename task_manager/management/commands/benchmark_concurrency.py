@@ -0,0 +1,55 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.benchmarks import concurrency
+from task_manager.benchmarks.data import USER_PREFIX
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput of the sync (WSGI) and async (ASGI) task pages "
+        "under concurrent clients on the seeded benchmark data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=8)
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=20,
+            help="Requests per client.",
+        )
+        parser.add_argument("--output", help="Write the JSON report here.")
+
+    def handle(self, *args, **options):
+        user = (
+            get_user_model().objects.filter(username=f"{USER_PREFIX}0").first()
+        )
+        if user is None:
+            raise CommandError("Run seed_benchmark_data first")
+
+        def report(page, result):
+            for mode, stats in result.items():
+                self.stdout.write(
+                    f"{page} {mode}: {stats['rps']} req/s "
+                    f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms"
+                )
+
+        try:
+            result = concurrency.run(
+                user,
+                clients=options["clients"],
+                requests=options["requests"],
+                report=report,
+            )
+        except RuntimeError as error:
+            raise CommandError(str(error)) from error
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as target:
+                json.dump(result, target, indent=2)
+            self.stdout.write(
+                self.style.SUCCESS(f"Report: {options['output']}")
+            )
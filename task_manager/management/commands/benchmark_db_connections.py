@@ -0,0 +1,34 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from task_manager.benchmarks import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request cost of getting a database connection "
+        "without reuse, with persistent connections and with a pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--output", help="Write the JSON report here.")
+
+    def handle(self, *args, **options):
+        result = connections.run(options["database"], options["requests"])
+        for mode, stats in result["modes"].items():
+            self.stdout.write(
+                f"{mode}: p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms "
+                f"mean={stats['mean_ms']}ms"
+            )
+        if "pool" not in result["modes"]:
+            self.stdout.write("pool: skipped (needs Postgres and psycopg_pool)")
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as target:
+                json.dump(result, target, indent=2)
+            self.stdout.write(
+                self.style.SUCCESS(f"Report: {options['output']}")
+            )
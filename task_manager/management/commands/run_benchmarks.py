@@ -0,0 +1,67 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.benchmarks import harness
+from task_manager.benchmarks.data import USER_PREFIX
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure p50/p95 latency, query count and peak memory of the task "
+        "views on the seeded benchmark data and write a JSON report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--output", default="benchmark.json")
+        parser.add_argument(
+            "--compare",
+            help="Previous report to print the difference against.",
+        )
+        parser.add_argument(
+            "--only",
+            action="append",
+            help="Run only scenarios whose name contains this text.",
+        )
+
+    def handle(self, *args, **options):
+        user = (
+            get_user_model().objects.filter(username=f"{USER_PREFIX}0").first()
+        )
+        if user is None:
+            raise CommandError("Run seed_benchmark_data first")
+
+        def report(name, result):
+            self.stdout.write(
+                f"{name}: p50={result['p50_ms']}ms p95={result['p95_ms']}ms "
+                f"queries={result['queries']} "
+                f"peak={result['peak_memory_kb']}KiB"
+            )
+
+        try:
+            result = harness.run(
+                user,
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                only=options["only"],
+                report=report,
+            )
+        except RuntimeError as error:
+            raise CommandError(str(error)) from error
+
+        harness.write_report(result, options["output"])
+        self.stdout.write(self.style.SUCCESS(f"Report: {options['output']}"))
+
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as source:
+                baseline = json.load(source)
+            for name, metric, before, after, ratio in harness.compare(
+                result, baseline
+            ):
+                change = f"x{ratio:.2f}" if ratio is not None else "n/a"
+                self.stdout.write(
+                    f"{name} {metric}: {before} -> {after} ({change})"
+                )
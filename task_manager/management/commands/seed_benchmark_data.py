@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.benchmarks.data import parse_size, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, labels, statuses and tasks for "
+        "benchmarks. Sizes accept suffixes: 10k, 100k, 1M."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", default="10k")
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--labels", type=int, default=30)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            tasks = parse_size(options["tasks"])
+        except ValueError as error:
+            raise CommandError(str(error)) from error
+
+        started = time.perf_counter()
+
+        def report(created):
+            self.stdout.write(f"{created}/{tasks} tasks", ending="\r")
+
+        created = seed(
+            tasks,
+            users=options["users"],
+            labels=options["labels"],
+            batch_size=options["batch_size"],
+            random_seed=options["seed"],
+            report=report if options["verbosity"] > 1 else None,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} tasks in {elapsed:.1f}s "
+                f"({created / elapsed if elapsed else created:.0f} rows/s)"
+            )
+        )
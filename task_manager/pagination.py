@@ -0,0 +1,207 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+NEXT = "next"
+PREVIOUS = "prev"
+
+
+def _encode_value(value):
+    if isinstance(value, datetime.datetime):
+        # Полная точность: курсор сравнивается на равенство
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(direction, values):
+    payload = json.dumps(
+        {"d": direction, "v": [_encode_value(value) for value in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction, values = payload["d"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
+    if direction not in (NEXT, PREVIOUS) or not isinstance(values, list):
+        return None
+    return direction, values
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor, previous_cursor, params):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.params = params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def _querystring(self, cursor):
+        params = self.params.copy()
+        params[KeysetPaginator.cursor_query_param] = cursor
+        return params.urlencode()
+
+    @property
+    def next_querystring(self):
+        return self._querystring(self.next_cursor)
+
+    @property
+    def previous_querystring(self):
+        return self._querystring(self.previous_cursor)
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over a unique ordering (e.g. created_at + id).
+
+    Pages are fetched with a WHERE on the ordering keys and LIMIT, so page N
+    costs the same as page 1: no OFFSET and no COUNT.
+    """
+
+    cursor_query_param = "cursor"
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = int(per_page)
+
+    @property
+    def keys(self):
+        return [key.lstrip("-") for key in self.ordering]
+
+    def _reversed_ordering(self):
+        return [
+            key[1:] if key.startswith("-") else f"-{key}"
+            for key in self.ordering
+        ]
+
+    def _key_field(self, key):
+        try:
+            return self.queryset.model._meta.get_field(key)
+        except FieldDoesNotExist:
+            # Аннотация, например ранг поиска
+            return self.queryset.query.annotations[key].output_field
+
+    def _parse_values(self, raw_values):
+        if len(raw_values) != len(self.ordering):
+            return None
+        # Курсор приходит от клиента: значение, не подходящее полю ключа
+        # (null, объект, строка вместо числа), — как битый курсор
+        try:
+            values = [
+                self._key_field(key).clean(value, None)
+                for key, value in zip(self.keys, raw_values, strict=True)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            return None
+        # clean() не проверяет null у нередактируемых полей (id, created_at)
+        return None if None in values else values
+
+    def _seek(self, values, direction):
+        condition = Q()
+        for index, key in enumerate(self.ordering):
+            name = key.lstrip("-")
+            descending = key.startswith("-")
+            if direction == PREVIOUS:
+                descending = not descending
+            lookup = "lt" if descending else "gt"
+            term = Q(**{f"{name}__{lookup}": values[index]})
+            for prev_name, prev_value in zip(
+                self.keys[:index], values[:index], strict=True
+            ):
+                term &= Q(**{prev_name: prev_value})
+            condition |= term
+        return condition
+
+    def _cursor_for(self, obj, direction):
+        return encode_cursor(
+            direction, [getattr(obj, key) for key in self.keys]
+        )
+
+    def page_queryset(self, values=None, direction=NEXT):
+        """Queryset of one page (plus one look-ahead row) after the cursor."""
+        if values is None:
+            queryset = self.queryset.order_by(*self.ordering)
+        elif direction == NEXT:
+            queryset = self.queryset.filter(self._seek(values, NEXT)).order_by(
+                *self.ordering
+            )
+        else:
+            queryset = self.queryset.filter(
+                self._seek(values, PREVIOUS)
+            ).order_by(*self._reversed_ordering())
+        return queryset[: self.per_page + 1]
+
+    def _position(self, cursor):
+        decoded = decode_cursor(cursor) if cursor else None
+        values = self._parse_values(decoded[1]) if decoded else None
+        direction = decoded[0] if values is not None else NEXT
+        return values, direction
+
+    def get_page(self, cursor, params):
+        values, direction = self._position(cursor)
+        rows = list(self.page_queryset(values, direction))
+        return self._page(rows, values, direction, params)
+
+    async def aget_page(self, cursor, params):
+        values, direction = self._position(cursor)
+        rows = [row async for row in self.page_queryset(values, direction)]
+        return self._page(rows, values, direction, params)
+
+    def _page(self, rows, values, direction, params):
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if direction == PREVIOUS:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self._cursor_for(rows[-1], NEXT)
+        if rows and has_previous:
+            previous_cursor = self._cursor_for(rows[0], PREVIOUS)
+
+        return KeysetPage(rows, next_cursor, previous_cursor, params)
+
+
+class KeysetPaginationMixin:
+    """Paginate a ListView with KeysetPaginator over a unique ``ordering``."""
+
+    def get_keyset_ordering(self, queryset):
+        return self.get_ordering()
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset, self.get_keyset_ordering(queryset), page_size
+        )
+        page = paginator.get_page(
+            self.request.GET.get(paginator.cursor_query_param),
+            self.request.GET,
+        )
+        return paginator, page, page.object_list, page.has_other_pages()
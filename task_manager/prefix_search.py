@@ -0,0 +1,21 @@
+"""
+Case-insensitive prefix search backed by expression indexes.
+
+``istartswith`` compiles to ``col LIKE 'ab%'`` on SQLite and to
+``UPPER(col::text) LIKE UPPER('ab%')`` on Postgres. A plain index serves
+neither, so migrations create a ``COLLATE NOCASE`` index on SQLite and an
+``UPPER(col::text) text_pattern_ops`` index on Postgres, each with its own
+copy of the SQL. SQLite loses these indexes when a migration rebuilds the
+table, so such a migration has to create them again. SQLite also folds case
+for ASCII letters only.
+"""
+
+from django.db.models import Q
+
+
+def prefix_filter(fields, text):
+    """Q matching rows where any of ``fields`` starts with ``text``."""
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__istartswith": text})
+    return condition
@@ -1,21 +1,34 @@
+from django.conf import settings
 from rollbar.contrib.django.middleware import RollbarNotifierMiddleware
 
+from task_manager import rollbar_queue
+
 
 class CustomRollbarNotifierMiddleware(RollbarNotifierMiddleware):
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+
+        # Отправка в фоне: ошибки не тормозят ответ и не держат воркер
+        queue_settings = getattr(settings, "ROLLBAR_QUEUE", {})
+        if queue_settings.get("enabled"):
+            rollbar_queue.install(
+                maxsize=queue_settings.get("maxsize", 1000),
+                batch_size=queue_settings.get("batch_size", 20),
+            )
+
     def get_extra_data(self, request, exc):
         """
-        Add custom data to Rollbar payload.
+        Add request timing and trace id to Rollbar payload.
         """
         extra_data = dict()
 
-        # Пример добавления произвольных метаданных (опционально)
-        extra_data = {
-            "trace_id": "aabbccddeeff",
-            "feature_flags": [
-                "feature_1",
-                "feature_2",
-            ],
-        }
+        # Цифры заполняет RequestTimingMiddleware, пока идет запрос
+        timing = getattr(request, "timing", None)
+        if timing is not None:
+            extra_data = {
+                "trace_id": timing.trace_id,
+                "timing": timing.as_dict(),
+            }
 
         return extra_data
 
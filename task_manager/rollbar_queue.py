@@ -0,0 +1,170 @@
+"""
+Non-blocking Rollbar delivery.
+
+Rollbar builds the payload on the request thread, then our payload handler
+puts the serialized item into a bounded in-process queue and tells Rollbar
+not to send it. A single worker thread drains the queue in batches over one
+keep-alive HTTP session. When the queue is full the oldest item is dropped,
+so a burst of errors never blocks or grows memory without limit.
+"""
+
+import atexit
+import json
+import logging
+import threading
+from collections import deque
+from urllib.parse import urljoin
+
+import requests
+import rollbar
+from rollbar.lib import defaultJSONEncode, events
+
+logger = logging.getLogger(__name__)
+
+
+class RollbarQueue:
+    def __init__(
+        self,
+        endpoint,
+        access_token,
+        maxsize=1000,
+        batch_size=20,
+        timeout=3,
+    ):
+        self.url = urljoin(endpoint, "item/")
+        self.access_token = access_token
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._stopping = False
+        self._thread = None
+        self._session = requests.Session()
+
+        self.enqueued = 0
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def start(self):
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="rollbar-queue", daemon=True
+            )
+            self._thread.start()
+
+    def put(self, payload_str):
+        with self._condition:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(payload_str)
+            self.enqueued += 1
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._items and not self._stopping:
+                    self._condition.wait()
+                if not self._items:
+                    return
+                batch = [
+                    self._items.popleft()
+                    for _ in range(min(self.batch_size, len(self._items)))
+                ]
+                self._in_flight = len(batch)
+
+            sent = sum(self._send(payload_str) for payload_str in batch)
+
+            with self._condition:
+                self.sent += sent
+                self.failed += len(batch) - sent
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    def _send(self, payload_str):
+        try:
+            response = self._session.post(
+                self.url,
+                data=payload_str,
+                headers={
+                    "Content-Type": "application/json",
+                    "X-Rollbar-Access-Token": self.access_token,
+                },
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except requests.RequestException as error:
+            logger.warning("Rollbar delivery failed: %r", error)
+            return False
+        return True
+
+    def flush(self, timeout=None):
+        """Wait until every queued item is delivered or dropped."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._items and not self._in_flight, timeout
+            )
+
+    def stop(self, timeout=5):
+        self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self):
+        with self._condition:
+            return {
+                "queued": len(self._items),
+                "enqueued": self.enqueued,
+                "sent": self.sent,
+                "failed": self.failed,
+                "dropped": self.dropped,
+            }
+
+    def handle_payload(self, payload, **kwargs):
+        self.put(json.dumps(payload, default=defaultJSONEncode))
+        # False: Rollbar не отправляет элемент сам
+        return False
+
+
+_queue = None
+_lock = threading.Lock()
+
+
+def get_queue():
+    return _queue
+
+
+def install(maxsize=1000, batch_size=20):
+    """
+    Route Rollbar payloads through the background queue (idempotent).
+
+    Without an access token Rollbar is not initialized and there is nothing
+    to deliver, so no worker is started and None is returned.
+    """
+    global _queue
+    with _lock:
+        if _queue is not None or not rollbar.SETTINGS.get("access_token"):
+            return _queue
+        _queue = RollbarQueue(
+            rollbar.SETTINGS["endpoint"],
+            rollbar.SETTINGS["access_token"],
+            maxsize=maxsize,
+            batch_size=batch_size,
+            timeout=rollbar.SETTINGS.get("timeout", 3),
+        )
+        _queue.start()
+        events.add_payload_handler(_queue.handle_payload)
+        atexit.register(_queue.stop)
+        return _queue
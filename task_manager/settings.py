@@ -1,10 +1,11 @@
 import os
 from pathlib import Path
 
-import dj_database_url
 import rollbar
 from dotenv import load_dotenv
 
+from task_manager.database import database_settings, replica_settings
+
 # ---------------------------------------------------------------------
 # Base
 # ---------------------------------------------------------------------
@@ -57,6 +58,10 @@ INSTALLED_APPS = [
 # ---------------------------------------------------------------------
 
 MIDDLEWARE = [
+    # Первым: учитывает время и SQL всех остальных слоев
+    "task_manager.timing_middleware.RequestTimingMiddleware",
+    # База для чтения выбирается на весь запрос, включая шаблон
+    "task_manager.db_router.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -67,7 +72,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     # Rollbar — ВАЖНО: последним
-    "rollbar.contrib.django.middleware.RollbarNotifierMiddleware",
+    "task_manager.rollbar_middleware.CustomRollbarNotifierMiddleware",
 ]
 
 # ---------------------------------------------------------------------
@@ -104,16 +109,81 @@ TEMPLATES = [
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-if DATABASE_URL:
-    DATABASES = {"default": dj_database_url.parse(DATABASE_URL)}
+# Постоянные соединения или пул psycopg — см. task_manager/database.py
+DATABASES = {
+    "default": database_settings(
+        DATABASE_URL, os.environ, BASE_DIR / "db.sqlite3"
+    ),
+    **replica_settings(os.getenv("DATABASE_REPLICA_URLS"), os.environ),
+}
+
+# Списки и карточки задач читают с реплик, запись — в default;
+# после POST браузер на DATABASE_REPLICA_PIN_SECONDS читает с default
+DATABASE_READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_REPLICA_PIN_SECONDS = int(
+    os.getenv("DATABASE_REPLICA_PIN_SECONDS", "10")
+)
+DATABASE_ROUTERS = ["task_manager.db_router.ReplicaRouter"]
+
+# ---------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------
+
+# Общий кеш нужен, чтобы инвалидация была видна всем воркерам gunicorn
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
 else:
-    DATABASES = {
+    CACHES = {
         "default": {
-            "ENGINE": "django.db.backends.sqlite3",
-            "NAME": BASE_DIR / "db.sqlite3",
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         }
     }
 
+# Без общего кеша версии из cache_versions.py у каждого воркера свои:
+# кеши, которые сбрасываются версией, тогда не используются
+SHARED_CACHE = bool(REDIS_URL)
+
+# ---------------------------------------------------------------------
+# Sessions / authentication
+# ---------------------------------------------------------------------
+
+# cached_db: сессия читается из кеша, БД — запасная копия;
+# cache: только кеш (сессии теряются при его очистке); db: без кеша.
+# Без общего кеша выход и смена пароля сбросили бы кеш одного воркера,
+# а остальные еще TIMEOUT принимали бы старую сессию — поэтому db
+SESSION_ENGINE = "django.contrib.sessions.backends." + os.getenv(
+    "SESSION_STORE", "cached_db" if REDIS_URL else "db"
+)
+
+# ModelBackend остается в списке: его путь записан в уже выданных сессиях
+AUTHENTICATION_BACKENDS = ["django.contrib.auth.backends.ModelBackend"]
+if REDIS_URL:
+    # Пользователь сессии тоже берется из кеша — см. users/backends.py
+    AUTHENTICATION_BACKENDS.insert(
+        0, "task_manager.users.backends.CachedModelBackend"
+    )
+
+# ---------------------------------------------------------------------
+# Task events
+# ---------------------------------------------------------------------
+
+# Поток /tasks/events/ открыт, пока открыта страница: под WSGI это занятый
+# навсегда воркер, поэтому только ASGI (task_manager/asgi.py). Хаб событий
+# живет в процессе, общего брокера нет — с несколькими воркерами события
+# терялись бы молча, поэтому и тогда поток выключен
+TASK_EVENTS_ENABLED = (
+    os.getenv("TASK_EVENTS", "True") == "True"
+    and os.getenv("DJANGO_ASGI", "False") == "True"
+    and int(os.getenv("WEB_CONCURRENCY", "1")) == 1
+)
+
 # ---------------------------------------------------------------------
 # Password validation
 # ---------------------------------------------------------------------
@@ -175,6 +245,26 @@ LOGOUT_REDIRECT_URL = "/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# ---------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # JSON-строка с таймингами на каждый запрос
+        "task_manager.timing": {
+            "handlers": ["console"],
+            "level": os.getenv("TIMING_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 # ---------------------------------------------------------------------
 # Rollbar
 # ---------------------------------------------------------------------
@@ -185,5 +275,11 @@ ROLLBAR = {
     "root": BASE_DIR,
 }
 
+ROLLBAR_QUEUE = {
+    "enabled": os.getenv("ROLLBAR_ASYNC", "True") == "True",
+    "maxsize": int(os.getenv("ROLLBAR_QUEUE_SIZE", "1000")),
+    "batch_size": int(os.getenv("ROLLBAR_BATCH_SIZE", "20")),
+}
+
 if ROLLBAR["access_token"]:
     rollbar.init(**ROLLBAR)
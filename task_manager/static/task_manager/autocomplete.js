@@ -0,0 +1,59 @@
+// Подгрузка вариантов для <select data-autocomplete-url>: сервер отдает
+// только выбранные значения, остальные приходят из JSON по мере ввода.
+(function () {
+  "use strict";
+
+  function setup(select) {
+    const input = document.createElement("input");
+    input.type = "search";
+    input.className = "form-control mb-1";
+    input.placeholder = select.dataset.autocompletePlaceholder || "";
+    input.setAttribute("aria-controls", select.id);
+    select.parentNode.insertBefore(input, select);
+
+    let timer = null;
+    let controller = null;
+
+    function render(results) {
+      // Выбранные варианты остаются, остальные заменяются результатами
+      for (const option of Array.from(select.options)) {
+        if (!option.selected && option.value !== "") {
+          option.remove();
+        }
+      }
+      const present = new Set(Array.from(select.options, (o) => o.value));
+      for (const item of results) {
+        const value = String(item.id);
+        if (!present.has(value)) {
+          select.add(new Option(item.text, value));
+        }
+      }
+    }
+
+    function load() {
+      if (controller) {
+        controller.abort();
+      }
+      controller = new AbortController();
+      const url = new URL(select.dataset.autocompleteUrl, window.location.href);
+      url.searchParams.set("q", input.value.trim());
+      fetch(url, {
+        signal: controller.signal,
+        headers: { Accept: "application/json" },
+      })
+        .then((response) => response.json())
+        .then((data) => render(data.results))
+        .catch(() => {});
+    }
+
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(load, 250);
+    });
+    select.addEventListener("focus", load, { once: true });
+  }
+
+  document.addEventListener("DOMContentLoaded", () => {
+    document.querySelectorAll("select[data-autocomplete-url]").forEach(setup);
+  });
+})();
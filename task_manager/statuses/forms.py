@@ -7,7 +7,8 @@ from task_manager.statuses.models import Status
 class StatusForm(forms.ModelForm):
     class Meta:
         model = Status
-        fields = ["name"]
+        fields = ["name", "is_closed"]
         labels = {
             "name": _("Имя"),
+            "is_closed": _("Закрывает задачу"),
         }
@@ -8,6 +8,13 @@ class Status(models.Model):
         unique=True,
         verbose_name=_("Name"),
     )
+    # Задачи в закрытом статусе не считаются открытыми
+    is_closed = models.BooleanField(
+        default=False,
+        verbose_name=_("Closed"),
+    )
+    # Поддерживается task_manager.tasks.counters
+    tasks_count = models.IntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
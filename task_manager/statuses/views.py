@@ -6,6 +6,7 @@ from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
 from task_manager.statuses.models import Status
+from task_manager.tasks.delete_impact import DeleteImpactMixin, status_impact
 
 from .forms import StatusForm
 
@@ -15,6 +16,7 @@ class StatusListView(LoginRequiredMixin, ListView):
     template_name = "task_manager/statuses/statuses.html"
     context_object_name = "statuses"
     login_url = reverse_lazy("login")
+    read_from_replica = True
 
 
 class StatusCreateView(LoginRequiredMixin, CreateView):
@@ -43,12 +45,15 @@ class StatusUpdateView(LoginRequiredMixin, UpdateView):
         return response
 
 
-class StatusDeleteView(LoginRequiredMixin, DeleteView):
+class StatusDeleteView(LoginRequiredMixin, DeleteImpactMixin, DeleteView):
     model = Status
     template_name = "task_manager/statuses/delete.html"
     success_url = reverse_lazy("statuses_list")
     login_url = reverse_lazy("login")
 
+    def get_delete_impact(self):
+        return status_impact(self.object)
+
     def post(self, request, *args, **kwargs):
         try:
             response = super().post(request, *args, **kwargs)
@@ -0,0 +1,237 @@
+"""
+Async task list and detail pages for the ASGI entry point.
+
+The pages are the ones of ``TaskListView`` and ``TaskDetailView``, built in
+the same steps: the conditional GET state first, then the page rows, the
+filter choices and the presets. The steps are awaited one after another:
+Django runs async ORM calls and ``sync_to_async`` helpers in the request's
+own thread over one connection, so awaiting them together would not run
+their SQL at the same time. The views are non-blocking rather than
+concurrent: a page takes as long as the sync one, but while it waits for
+the database the worker serves other requests.
+
+``TaskEventsView`` keeps a Server-Sent Events stream open per list page; an
+idle stream is one suspended coroutine waiting on its queue. Under WSGI the
+same stream would hold a worker thread for good, so outside the ASGI handler
+(or with the events off) the view answers 204 and the browser stops
+reconnecting.
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    StreamingHttpResponse,
+)
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.views.generic import View
+
+from task_manager.conditional import ConditionalGetMixin, has_pending_messages
+from task_manager.pagination import KeysetPaginator
+
+from . import events
+from .choices import get_choices
+from .events import TaskMatcher, format_message
+from .filters import TaskFilter
+from .forms import TaskBulkForm
+from .models import Task
+from .presets import load_presets
+from .queries import task_queryset
+from .search import RANK, is_ranked
+from .views import TaskDetailView, TaskListView
+
+
+class AsyncLoginRequiredMixin:
+    async def dispatch(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path(), reverse("login"))
+        # Фильтр и шаблон читают request.user синхронно — без второго запроса
+        request.user = user
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    def not_modified(self, validator_parts):
+        """Return (304 response or None, etag, last modified)."""
+        etag, last_modified = self.build_validators(validator_parts)
+        if etag is None:
+            return None, None, None
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            response = self.patch_validators(response, etag, last_modified)
+        return response, etag, last_modified
+
+
+class AsyncTaskListView(
+    AsyncLoginRequiredMixin, AsyncConditionalGetMixin, View
+):
+    # Настройки страницы читаем у синхронного вида при каждом запросе
+    sync_view = TaskListView
+    read_from_replica = True
+
+    def prepare(self):
+        # Сессия и проверка формы фильтра работают с БД синхронно
+        filterset = TaskFilter(
+            self.request.GET or None,
+            queryset=task_queryset(),
+            request=self.request,
+            load_choices=False,
+        )
+        valid = not filterset.is_bound or filterset.is_valid()
+        queryset = filterset.qs if valid else filterset.queryset.none()
+        conditional = valid and not has_pending_messages(self.request)
+        return filterset, queryset, conditional
+
+    async def get(self, request, *args, **kwargs):
+        filterset, queryset, conditional = await sync_to_async(self.prepare)()
+
+        etag = last_modified = None
+        if conditional:
+            state = await sync_to_async(self.sync_view.list_validator_parts)(
+                queryset, request.user
+            )
+            response, etag, last_modified = self.not_modified(state)
+            if response is not None:
+                return response
+
+        ordering = self.sync_view.ordering
+        if is_ranked(queryset):
+            ordering = (f"-{RANK}", *ordering)
+        paginator = KeysetPaginator(
+            queryset, ordering, self.sync_view.paginate_by
+        )
+        page = await paginator.aget_page(
+            request.GET.get(paginator.cursor_query_param), request.GET
+        )
+        choices = await sync_to_async(get_choices)(
+            *filterset.choice_fields.values()
+        )
+        presets = await sync_to_async(load_presets)(request)
+
+        filterset.set_choices(choices)
+        response = TemplateResponse(
+            request,
+            self.sync_view.template_name,
+            {
+                "view": self,
+                "filter": filterset,
+                "tasks": page.object_list,
+                "object_list": page.object_list,
+                "paginator": paginator,
+                "page_obj": page,
+                "is_paginated": page.has_other_pages(),
+                # Те же справочники, без повторной загрузки в async-контексте
+                "bulk_form": TaskBulkForm(choices=choices),
+                "presets": presets,
+                "events_enabled": events.enabled(),
+                "events_last_id": events.hub.last_id,
+            },
+        )
+        if etag is not None:
+            self.patch_validators(response, etag, last_modified)
+        return response
+
+
+class AsyncTaskDetailView(
+    AsyncLoginRequiredMixin, AsyncConditionalGetMixin, View
+):
+    sync_view = TaskDetailView
+    read_from_replica = True
+
+    async def get(self, request, pk, *args, **kwargs):
+        conditional = not await sync_to_async(has_pending_messages)(request)
+
+        etag = last_modified = None
+        if conditional:
+            state = await sync_to_async(self.sync_view.task_validator_parts)(pk)
+            response, etag, last_modified = self.not_modified(state)
+            if response is not None:
+                return response
+
+        task = await task_queryset().filter(pk=pk).afirst()
+        if task is None:
+            raise Http404("No task found matching the query")
+
+        response = TemplateResponse(
+            request,
+            self.sync_view.template_name,
+            {"view": self, "task": task, "object": task},
+        )
+        if etag is not None:
+            self.patch_validators(response, etag, last_modified)
+        return response
+
+
+class TaskEventsView(AsyncLoginRequiredMixin, View):
+    """Server-Sent Events of the tasks matching the list filter."""
+
+    hub = events.hub
+    heartbeat = 15
+    retry_ms = 3000
+
+    async def get(self, request, *args, **kwargs):
+        # 204 останавливает переподключения EventSource
+        if not events.enabled() or not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+
+        filterset = TaskFilter(
+            request.GET,
+            queryset=Task.objects.none(),
+            request=request,
+            load_choices=False,
+        )
+        if not await sync_to_async(filterset.is_valid)():
+            return HttpResponseBadRequest("Invalid task filter")
+
+        # Первое подключение продолжает с события, на котором отрисован список
+        last_event_id = request.headers.get("Last-Event-ID") or request.GET.get(
+            "last_event_id"
+        )
+        response = StreamingHttpResponse(
+            self.stream(
+                TaskMatcher(filterset.form.cleaned_data, request.user),
+                last_event_id,
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Без буферизации в nginx, иначе события приходят пачками
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, matcher, last_event_id):
+        subscriber, missed = self.hub.subscribe(last_event_id)
+        try:
+            yield f"retry: {self.retry_ms}\n\n"
+            if missed is None:
+                yield format_message("reset", "{}")
+                return
+            for event in missed:
+                message = matcher.message(event)
+                if message:
+                    yield message
+            # После переполнения очереди закрываем поток: браузер
+            # переподключится с Last-Event-ID и дочитает историю
+            while not subscriber.closed:
+                try:
+                    event = await asyncio.wait_for(
+                        subscriber.queue.get(), self.heartbeat
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                message = matcher.message(event)
+                if message:
+                    yield message
+        finally:
+            self.hub.unsubscribe(subscriber)
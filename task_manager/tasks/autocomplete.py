@@ -0,0 +1,101 @@
+"""
+Autocomplete for the executor and labels fields of TaskForm.
+
+The widgets render only the selected options plus the endpoint URL; the
+script in ``task_manager/autocomplete.js`` loads the rest on demand. The
+form fields keep their querysets, so submitted ids are validated with a
+single ``pk`` / ``pk__in`` lookup.
+"""
+
+from django import forms
+from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
+from django.utils.translation import gettext as _
+
+from task_manager.labels.models import Label
+from task_manager.prefix_search import prefix_filter
+from task_manager.users.queries import search_filter
+
+from .choices import user_display_name
+
+User = get_user_model()
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+
+def search_users(text, limit=DEFAULT_LIMIT):
+    users = User.objects.filter(is_active=True)
+    if text.strip():
+        users = users.filter(search_filter(text))
+    users = users.order_by(Lower("username")).only(
+        "username", "first_name", "last_name"
+    )[:limit]
+    return [{"id": user.pk, "text": user_display_name(user)} for user in users]
+
+
+def search_labels(text, limit=DEFAULT_LIMIT):
+    labels = Label.objects.all()
+    if text:
+        labels = labels.filter(prefix_filter(("name",), text))
+    return [
+        {"id": pk, "text": name}
+        for pk, name in labels.order_by(Lower("name")).values_list(
+            "pk", "name"
+        )[:limit]
+    ]
+
+
+class AutocompleteMixin:
+    """Render only the selected choices (like the admin autocomplete)."""
+
+    def __init__(self, url, attrs=None):
+        self.url = url
+        super().__init__(attrs)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete-url"] = str(self.url)
+        attrs["data-autocomplete-placeholder"] = _("Поиск")
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        selected = {str(item) for item in value if str(item).isdigit()}
+        choices = []
+        if not self.allow_multiple_selected and field.empty_label is not None:
+            choices.append(("", field.empty_label))
+        if selected:
+            choices += [
+                (obj.pk, field.label_from_instance(obj))
+                for obj in field.queryset.filter(pk__in=selected)
+            ]
+
+        groups = []
+        for index, (option_value, label) in enumerate(choices):
+            option = self.create_option(
+                name,
+                option_value,
+                label,
+                str(option_value) in selected,
+                index,
+                attrs=attrs,
+            )
+            groups.append((None, [option], index))
+        return groups
+
+    class Media:
+        js = ("task_manager/autocomplete.js",)
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass
+
+
+class UserChoiceField(forms.ModelChoiceField):
+    def label_from_instance(self, obj):
+        return user_display_name(obj)
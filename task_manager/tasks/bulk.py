@@ -0,0 +1,129 @@
+"""
+Bulk actions of the task list.
+
+Each action changes the selected tasks with set-based statements in one
+transaction: one ``UPDATE`` of ``tasks_task``, one ``TaskLabel`` INSERT or
+DELETE, or one DELETE of the tasks. ``updated_at`` is set explicitly, since
+``update()`` skips ``auto_now``. The counters are read once before the
+write and changed with a single ``Delta``; the per-row signal handlers are
+suspended, and ``run`` bumps the ``tasks`` cache version and publishes the
+change events once per action.
+"""
+
+from dataclasses import replace
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import counters
+from .events import on_commit_publish
+from .models import Task, TaskLabel
+from .presets import invalidate_tasks
+
+
+def _locked(task_ids):
+    # Состояние для счетчиков читаем под блокировкой строк задач
+    return Task.objects.filter(pk__in=task_ids).select_for_update(of=("self",))
+
+
+def _replace_tasks(tasks, with_labels, **changes):
+    """UPDATE the tasks, count the moved (old -> new) states, return ids."""
+    old_states = counters.load_states(tasks, with_labels=with_labels)
+    updated = list(old_states)
+    Task.objects.filter(pk__in=updated).update(
+        updated_at=timezone.now(), **changes
+    )
+    delta = counters.Delta()
+    for state in old_states.values():
+        delta.add_task(state, -1)
+        delta.add_task(replace(state, **_state_changes(changes)), 1)
+    delta.apply()
+    return updated
+
+
+def _state_changes(changes):
+    result = {}
+    if "status" in changes:
+        result["status_id"] = changes["status"].pk
+        result["is_open"] = not changes["status"].is_closed
+    if "executor" in changes:
+        executor = changes["executor"]
+        result["executor_id"] = executor.pk if executor else None
+    return result
+
+
+@transaction.atomic
+def set_status(task_ids, status):
+    tasks = _locked(task_ids).exclude(status=status)
+    # Метки нужны закрывающимся и открывающимся задачам; у остальных их
+    # изменения в Delta взаимно сокращаются
+    return _replace_tasks(tasks, True, status=status)
+
+
+@transaction.atomic
+def set_executor(task_ids, executor):
+    tasks = _locked(task_ids)
+    if executor is None:
+        tasks = tasks.exclude(executor__isnull=True)
+    else:
+        tasks = tasks.exclude(executor=executor)
+    return _replace_tasks(tasks, False, executor=executor)
+
+
+@transaction.atomic
+def add_label(task_ids, label):
+    tasks = _locked(task_ids).exclude(labels=label)
+    added = list(tasks.values_list("pk", flat=True))
+    TaskLabel.objects.bulk_create(
+        (TaskLabel(task_id=pk, label=label) for pk in added),
+        ignore_conflicts=True,
+    )
+    Task.objects.filter(pk__in=added).update(updated_at=timezone.now())
+    counters.apply_label_pairs([(pk, label.pk) for pk in added], 1)
+    return added
+
+
+@transaction.atomic
+def remove_label(task_ids, label):
+    tasks = _locked(task_ids).filter(labels=label)
+    removed = list(tasks.values_list("pk", flat=True))
+    TaskLabel.objects.filter(task_id__in=removed, label=label).delete()
+    Task.objects.filter(pk__in=removed).update(updated_at=timezone.now())
+    counters.apply_label_pairs([(pk, label.pk) for pk in removed], -1)
+    return removed
+
+
+@transaction.atomic
+def delete(task_ids, user):
+    """Delete the selected tasks authored by ``user``, return their ids."""
+    tasks = _locked(task_ids).filter(author=user)
+    states = counters.load_states(tasks, with_labels=True)
+    with counters.suspended():
+        Task.objects.filter(pk__in=list(states)).delete()
+    delta = counters.Delta()
+    for state in states.values():
+        delta.add_task(state, -1)
+    delta.apply()
+    return list(states)
+
+
+def run(action, task_ids, user, status=None, executor=None, label=None):
+    """Apply a ``TaskBulkForm`` action and return the number of tasks."""
+    if action == "status":
+        changed = set_status(task_ids, status)
+    elif action == "executor":
+        changed = set_executor(task_ids, executor)
+    elif action == "add_label":
+        changed = add_label(task_ids, label)
+    elif action == "remove_label":
+        changed = remove_label(task_ids, label)
+    elif action == "delete":
+        changed = delete(task_ids, user)
+    else:
+        raise ValueError(f"Unknown bulk action {action!r}")
+    if changed:
+        invalidate_tasks()
+        on_commit_publish(
+            "deleted" if action == "delete" else "updated", changed
+        )
+    return len(changed)
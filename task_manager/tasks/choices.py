@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+from task_manager.cache_versions import bump_version, get_version, is_shared
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+
+User = get_user_model()
+
+NAMESPACE = "task_choices"
+TIMEOUT = 60 * 60
+
+
+def user_display_name(user):
+    return user.get_full_name() or user.username
+
+
+def _statuses():
+    return list(Status.objects.order_by("name").values_list("pk", "name"))
+
+
+def _executors():
+    users = User.objects.order_by("username").only(
+        "username", "first_name", "last_name"
+    )
+    return [(user.pk, user_display_name(user)) for user in users]
+
+
+def _labels():
+    return list(Label.objects.order_by("name").values_list("pk", "name"))
+
+
+LOADERS = {
+    "statuses": _statuses,
+    "executors": _executors,
+    "labels": _labels,
+}
+
+
+def get_choices(*names):
+    """Reference lists as (pk, label) pairs, loaded from DB on cache miss."""
+    if not is_shared():
+        return {name: LOADERS[name]() for name in names}
+
+    version = get_version(NAMESPACE)
+    keys = {name: f"{NAMESPACE}:{name}:{version}" for name in names}
+    cached = cache.get_many(keys.values())
+
+    result = {}
+    for name, key in keys.items():
+        if key not in cached:
+            cached[key] = LOADERS[name]()
+            cache.set(key, cached[key], TIMEOUT)
+        result[name] = cached[key]
+    return result
+
+
+def set_cached_choices(fields, choices=None):
+    """
+    Render model choice fields from the cache.
+
+    The fields keep their querysets, so submitted values are still validated
+    against the database with a single pk lookup. ``choices`` already loaded
+    with ``get_choices`` are used as is.
+    """
+    if choices is None:
+        choices = get_choices(*fields.values())
+    for field, name in fields.items():
+        values = choices[name]
+        if getattr(field, "empty_label", None) is not None:
+            values = [("", field.empty_label), *values]
+        # Только виджет: field.choices у django-filter пересоздает итератор
+        field.widget.choices = values
+
+
+def invalidate_choices(sender, update_fields=None, **kwargs):
+    # Вход пользователя обновляет только last_login — списки не меняются
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    # И после коммита: параллельный запрос мог закешировать старые списки
+    # под новой версией, пока транзакция не завершилась
+    bump_version(NAMESPACE)
+    transaction.on_commit(lambda: bump_version(NAMESPACE))
@@ -0,0 +1,383 @@
+"""
+Denormalized task counters.
+
+``Status.tasks_count``, ``Label.tasks_count`` / ``open_tasks_count``, the
+``Profile`` counters and ``TaskDailyCount`` are changed by deltas inside
+the transaction of the task write that causes them: model signals cover
+``save``, ``delete`` and the ``labels`` many-to-many manager. Writes that bypass signals
+(``bulk_create``, ``update``, raw SQL, deleting ``TaskLabel`` rows
+directly) must apply a ``Delta`` themselves or be followed by ``recount``;
+inside ``suspended()`` the signal handlers do nothing, for set-based writes
+that count their own ``Delta``.
+"""
+
+import datetime
+import functools
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.users.models import Profile
+
+from .models import Task, TaskDailyCount, TaskLabel
+
+
+@dataclass(frozen=True)
+class TaskState:
+    status_id: int
+    is_open: bool
+    author_id: int
+    executor_id: int | None
+    label_ids: tuple = ()
+    created_on: datetime.date | None = None
+
+
+class Delta:
+    def __init__(self):
+        self.changes = defaultdict(Counter)
+
+    def add(self, model, pk, field, amount):
+        self.changes[model, pk][field] += amount
+
+    def add_labels(self, label_ids, is_open, sign):
+        for label_id in label_ids:
+            self.add(Label, label_id, "tasks_count", sign)
+            if is_open:
+                self.add(Label, label_id, "open_tasks_count", sign)
+
+    def add_task(self, state, sign):
+        self.add(Status, state.status_id, "tasks_count", sign)
+        self.add(Profile, state.author_id, "authored_tasks_count", sign)
+        if state.executor_id:
+            self.add(Profile, state.executor_id, "assigned_tasks_count", sign)
+            if state.is_open:
+                self.add(
+                    Profile,
+                    state.executor_id,
+                    "open_assigned_tasks_count",
+                    sign,
+                )
+        self.add_labels(state.label_ids, state.is_open, sign)
+        if state.created_on is not None:
+            self.add(TaskDailyCount, state.created_on, "created_count", sign)
+
+    def apply(self):
+        # Строки с одинаковыми изменениями обновляются одним UPDATE
+        groups = defaultdict(list)
+        for (model, pk), fields in self.changes.items():
+            fields = tuple(sorted((f, n) for f, n in fields.items() if n))
+            if fields:
+                groups[model, fields].append(pk)
+
+        for (model, fields), pks in groups.items():
+            if model is TaskDailyCount:
+                # Строка дня появляется с первой задачей этого дня
+                model.objects.bulk_create(
+                    (model(day=day) for day in pks), ignore_conflicts=True
+                )
+            updated = model.objects.filter(pk__in=pks).update(
+                **{field: F(field) + amount for field, amount in fields}
+            )
+            if model is Profile and updated < len(pks):
+                existing = model.objects.filter(pk__in=pks).values_list(
+                    "pk", flat=True
+                )
+                recount_profiles(set(pks) - set(existing))
+        self.changes.clear()
+
+
+def load_states(tasks, with_labels=False):
+    """States of the tasks in a queryset, by task id."""
+    states = {}
+    rows = tasks.order_by().values_list(
+        "pk",
+        "status_id",
+        "status__is_closed",
+        "author_id",
+        "executor_id",
+        "created_at",
+    )
+    for pk, status_id, is_closed, author_id, executor_id, created_at in rows:
+        states[pk] = TaskState(
+            status_id,
+            not is_closed,
+            author_id,
+            executor_id,
+            created_on=timezone.localdate(created_at),
+        )
+    if with_labels and states:
+        label_ids = defaultdict(list)
+        links = TaskLabel.objects.filter(task_id__in=list(states)).values_list(
+            "task_id", "label_id"
+        )
+        for task_id, label_id in links:
+            label_ids[task_id].append(label_id)
+        for pk, state in states.items():
+            states[pk] = replace(state, label_ids=tuple(label_ids[pk]))
+    return states
+
+
+def load_state(task_id, with_labels=False):
+    return load_states(Task.objects.filter(pk=task_id), with_labels).get(
+        task_id
+    )
+
+
+def task_label_ids(task_id):
+    return tuple(
+        TaskLabel.objects.filter(task_id=task_id).values_list(
+            "label_id", flat=True
+        )
+    )
+
+
+def apply_label_pairs(pairs, sign):
+    """Count (task_id, label_id) links that were added or removed."""
+    if not pairs:
+        return
+    open_tasks = set(
+        Task.objects.filter(
+            pk__in={task_id for task_id, _ in pairs}, status__is_closed=False
+        ).values_list("pk", flat=True)
+    )
+    delta = Delta()
+    for task_id, label_id in pairs:
+        delta.add_labels([label_id], task_id in open_tasks, sign)
+    delta.apply()
+
+
+# ----------------------------- signals ---------------------------------
+
+_suspended = ContextVar("task_counters_suspended", default=False)
+
+
+@contextmanager
+def suspended():
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def unless_suspended(handler):
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        if not _suspended.get():
+            handler(*args, **kwargs)
+
+    return wrapper
+
+
+@unless_suspended
+def snapshot_task(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance._counter_state = load_state(instance.pk) if instance.pk else None
+
+
+@unless_suspended
+def count_saved_task(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old = instance.__dict__.pop("_counter_state", None)
+    new = TaskState(
+        instance.status_id,
+        not instance.status.is_closed,
+        instance.author_id,
+        instance.executor_id,
+        created_on=timezone.localdate(instance.created_at),
+    )
+    if old == new:
+        return
+    if old is not None and old.is_open != new.is_open:
+        # Открытость задачи изменилась — нужны ее метки
+        label_ids = task_label_ids(instance.pk)
+        old = replace(old, label_ids=label_ids)
+        new = replace(new, label_ids=label_ids)
+
+    delta = Delta()
+    if old is not None:
+        delta.add_task(old, -1)
+    delta.add_task(new, 1)
+    delta.apply()
+
+
+@unless_suspended
+def snapshot_deleted_task(sender, instance, **kwargs):
+    instance._counter_state = load_state(instance.pk, with_labels=True)
+
+
+@unless_suspended
+def count_deleted_task(sender, instance, **kwargs):
+    state = instance.__dict__.pop("_counter_state", None)
+    if state is not None:
+        delta = Delta()
+        delta.add_task(state, -1)
+        delta.apply()
+
+
+@unless_suspended
+def count_label_links(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("pre_remove", "pre_clear"):
+        links = sender.objects.filter(
+            **{"label" if reverse else "task": instance}
+        )
+        if action == "pre_remove":
+            links = links.filter(
+                **{"task_id__in" if reverse else "label_id__in": pk_set}
+            )
+        instance._counter_links = list(links.values_list("task_id", "label_id"))
+    elif action in ("post_remove", "post_clear"):
+        apply_label_pairs(instance.__dict__.pop("_counter_links", []), -1)
+    elif action == "post_add":
+        # pk_set содержит только действительно добавленные связи
+        if reverse:
+            pairs = [(task_id, instance.pk) for task_id in pk_set]
+        else:
+            pairs = [(instance.pk, label_id) for label_id in pk_set]
+        apply_label_pairs(pairs, 1)
+
+
+@unless_suspended
+def count_created_link(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        apply_label_pairs([(instance.task_id, instance.label_id)], 1)
+
+
+@unless_suspended
+def snapshot_status(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk:
+        return
+    instance._was_closed = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("is_closed", flat=True)
+        .first()
+    )
+
+
+@unless_suspended
+def recount_reopened(sender, instance, created, raw=False, **kwargs):
+    was_closed = instance.__dict__.pop("_was_closed", None)
+    if raw or created or was_closed in (None, instance.is_closed):
+        return
+    tasks = Task.objects.filter(status=instance)
+    recount_labels(tasks.values("labels"))
+    recount_profiles(tasks.values("executor"))
+
+
+# ----------------------------- recount ---------------------------------
+
+
+def _count(queryset, field):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def _recount(queryset, **counts):
+    # Обновляем только разошедшиеся строки и возвращаем их число
+    drifted = Q()
+    for field, value in counts.items():
+        drifted |= ~Q(**{field: value})
+    return queryset.filter(drifted).update(**counts)
+
+
+def recount_statuses(ids=None, apps=global_apps):
+    Status = apps.get_model("statuses", "Status")
+    Task = apps.get_model("tasks", "Task")
+    statuses = Status.objects.all()
+    if ids is not None:
+        statuses = statuses.filter(pk__in=ids)
+    return _recount(statuses, tasks_count=_count(Task.objects.all(), "status"))
+
+
+def recount_labels(ids=None, apps=global_apps):
+    Label = apps.get_model("labels", "Label")
+    TaskLabel = apps.get_model("tasks", "TaskLabel")
+    labels = Label.objects.all()
+    if ids is not None:
+        labels = labels.filter(pk__in=ids)
+    links = TaskLabel.objects.all()
+    return _recount(
+        labels,
+        tasks_count=_count(links, "label"),
+        open_tasks_count=_count(
+            links.filter(task__status__is_closed=False), "label"
+        ),
+    )
+
+
+def recount_profiles(user_ids=None, apps=global_apps):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Profile = apps.get_model("users", "Profile")
+    Task = apps.get_model("tasks", "Task")
+
+    users = User.objects.all()
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    Profile.objects.bulk_create(
+        (Profile(user_id=pk) for pk in users.values_list("pk", flat=True)),
+        ignore_conflicts=True,
+    )
+
+    profiles = Profile.objects.all()
+    if user_ids is not None:
+        profiles = profiles.filter(pk__in=user_ids)
+    tasks = Task.objects.all()
+    return _recount(
+        profiles,
+        authored_tasks_count=_count(tasks, "author"),
+        assigned_tasks_count=_count(tasks, "executor"),
+        open_assigned_tasks_count=_count(
+            tasks.filter(status__is_closed=False), "executor"
+        ),
+    )
+
+
+def recount_days(apps=global_apps):
+    TaskDailyCount = apps.get_model("tasks", "TaskDailyCount")
+    Task = apps.get_model("tasks", "Task")
+    actual = dict(
+        Task.objects.order_by()
+        .values_list(TruncDate("created_at"))
+        .annotate(count=Count("pk"))
+    )
+    stored = dict(TaskDailyCount.objects.values_list("day", "created_count"))
+    drifted = [
+        TaskDailyCount(day=day, created_count=actual.get(day, 0))
+        for day in actual.keys() | stored.keys()
+        if actual.get(day, 0) != stored.get(day)
+    ]
+    TaskDailyCount.objects.bulk_create(
+        drifted,
+        update_conflicts=True,
+        unique_fields=["day"],
+        update_fields=["created_count"],
+    )
+    return len(drifted)
+
+
+def recount(apps=global_apps):
+    return {
+        "statuses": recount_statuses(apps=apps),
+        "labels": recount_labels(apps=apps),
+        "profiles": recount_profiles(apps=apps),
+        "days": recount_days(apps=apps),
+    }
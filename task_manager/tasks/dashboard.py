@@ -0,0 +1,59 @@
+"""
+Numbers for the dashboard on the index page.
+
+Everything is read from the counters kept by ``counters``: one row per
+status, the top rows of the ``Profile`` index on ``assigned_tasks_count``
+and one ``TaskDailyCount`` row per day, so the page costs the same for a
+hundred tasks and for millions.
+"""
+
+import datetime
+
+from django.utils import timezone
+
+from task_manager.statuses.models import Status
+from task_manager.users.models import Profile
+
+from .models import TaskDailyCount
+
+DAYS = 14
+TOP_EXECUTORS = 10
+
+
+def _share(count, largest):
+    return round(count * 100 / largest) if largest else 0
+
+
+def daily_counts(days=DAYS):
+    today = timezone.localdate()
+    first = today - datetime.timedelta(days=days - 1)
+    stored = dict(
+        TaskDailyCount.objects.filter(day__gte=first).values_list(
+            "day", "created_count"
+        )
+    )
+    largest = max(stored.values(), default=0)
+    series = []
+    for offset in range(days):
+        day = first + datetime.timedelta(days=offset)
+        # Дня без задач в таблице может не быть
+        count = stored.get(day, 0)
+        series.append(
+            {"day": day, "count": count, "share": _share(count, largest)}
+        )
+    return series
+
+
+def dashboard():
+    statuses = list(Status.objects.order_by("name"))
+    executors = list(
+        Profile.objects.filter(assigned_tasks_count__gt=0)
+        .select_related("user")
+        .order_by("-assigned_tasks_count")[:TOP_EXECUTORS]
+    )
+    return {
+        "total": sum(status.tasks_count for status in statuses),
+        "statuses": statuses,
+        "executors": executors,
+        "days": daily_counts(),
+    }
@@ -0,0 +1,257 @@
+"""
+Task change events for the Server-Sent Events stream of the task list.
+
+Task writes publish ``created`` / ``updated`` / ``deleted`` events after
+their transaction commits. The hub fans them out to the open streams of the
+same process: every stream has a bounded ``asyncio.Queue`` filled with
+``call_soon_threadsafe`` from the thread that committed, so the ORM threads
+never wait for slow clients. A stream whose queue overflows is closed; the
+browser reconnects with ``Last-Event-ID`` and gets the missed events from
+the short history, or a ``reset`` event when they are gone.
+
+The hub is in-process: a stream sees the writes of its own worker. Without
+a broker the stream is on only under ASGI with one worker
+(``settings.TASK_EVENTS_ENABLED``); otherwise nothing is published and the
+list page does not open the stream.
+"""
+
+import asyncio
+import contextlib
+import functools
+import json
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+
+from .counters import unless_suspended
+from .queries import task_queryset
+from .search import search_terms
+
+HISTORY = 1000
+BUFFER = 100
+
+
+@dataclass(frozen=True)
+class TaskEvent:
+    seq: int
+    id: str
+    kind: str
+    task: dict
+    # Слова названия и описания для поиска, в браузер не отправляются
+    words: tuple = ()
+
+    @functools.cached_property
+    def data(self):
+        return json.dumps(self.task)
+
+
+class Subscriber:
+    def __init__(self, loop, size):
+        self.loop = loop
+        self.queue = asyncio.Queue(size)
+        self.overflowed = False
+
+    def put(self, event):
+        # Выполняется в цикле событий подписчика
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    @property
+    def closed(self):
+        return self.overflowed and self.queue.empty()
+
+
+class Hub:
+    def __init__(self, history=HISTORY, buffer=BUFFER):
+        # Номера событий после перезапуска процесса не продолжаются
+        self.boot = uuid.uuid4().hex[:8]
+        self.seq = 0
+        self.history = deque(maxlen=history)
+        self.buffer = buffer
+        self.subscribers = set()
+        self.lock = threading.Lock()
+
+    def publish(self, kind, task, words=()):
+        with self.lock:
+            self.seq += 1
+            event = TaskEvent(
+                self.seq, f"{self.boot}-{self.seq}", kind, task, words
+            )
+            self.history.append(event)
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            # RuntimeError: цикл уже закрыт, подписчик уйдет в своем finally
+            with contextlib.suppress(RuntimeError):
+                subscriber.loop.call_soon_threadsafe(subscriber.put, event)
+        return event
+
+    @property
+    def last_id(self):
+        return f"{self.boot}-{self.seq}"
+
+    def skip(self):
+        """Drop an event nobody listens to; resumes across it reset."""
+        with self.lock:
+            self.seq += 1
+            self.history.clear()
+
+    def subscribe(self, last_event_id=None):
+        """
+        Return (subscriber, missed events), or (subscriber, None) when the
+        events after ``last_event_id`` are no longer in the history.
+        """
+        subscriber = Subscriber(asyncio.get_running_loop(), self.buffer)
+        with self.lock:
+            self.subscribers.add(subscriber)
+            return subscriber, self._since(last_event_id)
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def _since(self, last_event_id):
+        if not last_event_id:
+            return []
+        boot, _, seq = last_event_id.partition("-")
+        if boot != self.boot or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq >= self.seq:
+            return []
+        if not self.history or self.history[0].seq > seq + 1:
+            return None
+        return [event for event in self.history if event.seq > seq]
+
+
+hub = Hub()
+
+
+def task_payload(task):
+    return {
+        "id": task.pk,
+        "url": reverse("task_detail", kwargs={"pk": task.pk}),
+        "name": task.name,
+        "status_id": task.status_id,
+        "status": task.status.name,
+        "author_id": task.author_id,
+        "author": str(task.author),
+        "executor_id": task.executor_id,
+        "executor": str(task.executor) if task.executor else None,
+        "label_ids": [label.pk for label in task.label_list],
+        "labels": [label.name for label in task.label_list],
+        "created_at": task.created_at.isoformat(),
+    }
+
+
+def publish_tasks(kind, task_ids):
+    if not hub.subscribers:
+        hub.skip()
+        return
+    if kind == "deleted":
+        for pk in task_ids:
+            hub.publish(kind, {"id": pk})
+        return
+    for task in task_queryset().filter(pk__in=task_ids).order_by("pk"):
+        words = search_terms(f"{task.name} {task.description}")
+        hub.publish(
+            kind, task_payload(task), tuple(word.casefold() for word in words)
+        )
+
+
+def enabled():
+    return settings.TASK_EVENTS_ENABLED
+
+
+def on_commit_publish(kind, task_ids):
+    if not enabled():
+        return
+    task_ids = list(task_ids)
+    if task_ids:
+        transaction.on_commit(lambda: publish_tasks(kind, task_ids))
+
+
+@unless_suspended
+def publish_saved_task(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        on_commit_publish("created" if created else "updated", [instance.pk])
+
+
+@unless_suspended
+def publish_deleted_task(sender, instance, **kwargs):
+    on_commit_publish("deleted", [instance.pk])
+
+
+@unless_suspended
+def publish_created_link(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        on_commit_publish("updated", [instance.task_id])
+
+
+@unless_suspended
+def publish_label_links(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # После очистки задачи метки уже не найти
+        instance._event_task_ids = list(
+            sender.objects.filter(label=instance).values_list(
+                "task_id", flat=True
+            )
+        )
+    elif action == "post_clear":
+        task_ids = instance.__dict__.pop("_event_task_ids", [instance.pk])
+        on_commit_publish("updated", task_ids)
+    elif action in ("post_add", "post_remove"):
+        on_commit_publish("updated", pk_set if reverse else [instance.pk])
+
+
+class TaskMatcher:
+    """The ``TaskFilter`` of one stream, checked on event payloads."""
+
+    def __init__(self, cleaned_data, user):
+        data = cleaned_data or {}
+        self.status = data.get("status")
+        self.executor = data.get("executor")
+        self.label = data.get("label")
+        self.author = user if data.get("self_tasks") else None
+        self.terms = [term.casefold() for term in search_terms(data.get("q"))]
+
+    def matches(self, task):
+        fields = (
+            (self.status, "status_id"),
+            (self.executor, "executor_id"),
+            (self.author, "author_id"),
+        )
+        if any(value and task[key] != value.pk for value, key in fields):
+            return False
+        return not self.label or self.label.pk in task["label_ids"]
+
+    def matches_text(self, words):
+        # Как в search(): каждое слово запроса — префикс слова задачи
+        return all(
+            any(word.startswith(term) for word in words) for term in self.terms
+        )
+
+    def message(self, event):
+        """The SSE message of an event for this stream, or None."""
+        removed = json.dumps({"id": event.task["id"]})
+        if event.kind == "deleted":
+            return format_message("removed", removed, event.id)
+        if self.matches(event.task) and self.matches_text(event.words):
+            return format_message(event.kind, event.data, event.id)
+        if event.kind == "updated":
+            # Задача вышла из фильтра — страница уберет строку, если она есть
+            return format_message("removed", removed, event.id)
+        return None
+
+
+def format_message(kind, data, event_id=None):
+    lines = [f"event: {kind}", f"data: {data}"]
+    if event_id is not None:
+        lines.insert(0, f"id: {event_id}")
+    return "\n".join(lines) + "\n\n"
@@ -7,6 +7,9 @@ from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 from task_manager.tasks.models import Task
 
+from .choices import set_cached_choices
+from .search import search
+
 
 class TaskFilter(django_filters.FilterSet):
     status = django_filters.ModelChoiceFilter(
@@ -31,6 +34,12 @@ class TaskFilter(django_filters.FilterSet):
         widget=forms.Select(attrs={"class": "form-control"}),
     )
 
+    q = django_filters.CharFilter(
+        method="filter_search",
+        label=_("Поиск"),
+        widget=forms.TextInput(attrs={"class": "form-control"}),
+    )
+
     self_tasks = django_filters.BooleanFilter(
         method="filter_self_tasks",
         label=_("Только свои задачи"),
@@ -44,6 +53,7 @@ class TaskFilter(django_filters.FilterSet):
             "executor",
             "label",
             "self_tasks",
+            "q",
         )
 
     def filter_self_tasks(self, queryset, name, value):
@@ -51,15 +61,27 @@ class TaskFilter(django_filters.FilterSet):
             return queryset.filter(author=self.request.user)
         return queryset
 
-    def __init__(self, *args, **kwargs):
+    def filter_search(self, queryset, name, value):
+        return search(queryset, value)
+
+    def __init__(self, *args, load_choices=True, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.filters["status"].queryset = Status.objects.all().order_by("name")
-        self.filters["executor"].queryset = User.objects.all().order_by(
-            "username"
-        )
-        self.filters["label"].queryset = Label.objects.all().order_by("name")
+        self.filters["status"].queryset = Status.objects.all()
+        self.filters["executor"].queryset = User.objects.all()
+        self.filters["label"].queryset = Label.objects.all()
 
-        self.form.fields["executor"].label_from_instance = (
-            lambda user: user.get_full_name() or user.username
-        )
+        # Асинхронный список загружает справочники отдельным шагом
+        if load_choices:
+            self.set_choices()
+
+    @property
+    def choice_fields(self):
+        return {
+            self.form.fields["status"]: "statuses",
+            self.form.fields["executor"]: "executors",
+            self.form.fields["label"]: "labels",
+        }
+
+    def set_choices(self, choices=None):
+        set_cached_choices(self.choice_fields, choices)
@@ -1,25 +1,38 @@
 from django import forms
 from django.contrib.auth import get_user_model
+from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
 from task_manager.labels.models import Label
-from task_manager.tasks.models import Task
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import FilterPreset, Task
+
+from .autocomplete import (
+    AutocompleteSelect,
+    AutocompleteSelectMultiple,
+    UserChoiceField,
+)
+from .choices import set_cached_choices
+from .label_sync import sync_labels
+from .presets import normalize_query
 
 User = get_user_model()
 
 
 class TaskForm(forms.ModelForm):
-    executor = forms.ModelChoiceField(
-        queryset=User.objects.none(),
+    executor = UserChoiceField(
+        queryset=User.objects.all(),
         required=False,
         label=_("Исполнитель"),
         empty_label=_("---------"),
+        widget=AutocompleteSelect(reverse_lazy("autocomplete_executors")),
     )
 
     labels = forms.ModelMultipleChoiceField(
-        queryset=Label.objects.none(),
+        queryset=Label.objects.all(),
         required=False,
         label=_("Метки"),
+        widget=AutocompleteSelectMultiple(reverse_lazy("autocomplete_labels")),
     )
 
     class Meta:
@@ -34,9 +47,93 @@ class TaskForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.fields["executor"].queryset = User.objects.all()
-        self.fields["executor"].label_from_instance = (
-            lambda user: user.get_full_name() or user.username
+        # Исполнители и метки подгружаются через autocomplete
+        set_cached_choices({self.fields["status"]: "statuses"})
+
+    def _save_m2m(self):
+        # Метки — единственное m2m-поле формы; вместо labels.set() пишем
+        # только разницу
+        sync_labels(self.instance, self.cleaned_data["labels"])
+
+
+class TaskBulkForm(forms.Form):
+    ACTIONS = (
+        ("status", _("Сменить статус")),
+        ("executor", _("Назначить исполнителя")),
+        ("add_label", _("Добавить метку")),
+        ("remove_label", _("Снять метку")),
+        ("delete", _("Удалить")),
+    )
+    # Действие -> поле, без которого его не выполнить
+    REQUIRED = {
+        "status": "status",
+        "add_label": "label",
+        "remove_label": "label",
+    }
+
+    action = forms.ChoiceField(
+        choices=ACTIONS,
+        label=_("Действие"),
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    tasks = forms.ModelMultipleChoiceField(
+        queryset=Task.objects.only("pk"),
+        widget=forms.MultipleHiddenInput,
+    )
+    status = forms.ModelChoiceField(
+        queryset=Status.objects.all(),
+        required=False,
+        label=_("Статус"),
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    executor = UserChoiceField(
+        queryset=User.objects.all(),
+        required=False,
+        label=_("Исполнитель"),
+        empty_label=_("Без исполнителя"),
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    label = forms.ModelChoiceField(
+        queryset=Label.objects.all(),
+        required=False,
+        label=_("Метка"),
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+
+    def __init__(self, *args, choices=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        set_cached_choices(
+            {
+                self.fields["status"]: "statuses",
+                self.fields["executor"]: "executors",
+                self.fields["label"]: "labels",
+            },
+            choices,
         )
 
-        self.fields["labels"].queryset = Label.objects.all()
+    def clean(self):
+        cleaned_data = super().clean()
+        required = self.REQUIRED.get(cleaned_data.get("action"))
+        if required and not cleaned_data.get(required):
+            self.add_error(required, _("Обязательное поле."))
+        return cleaned_data
+
+
+class FilterPresetForm(forms.ModelForm):
+    class Meta:
+        model = FilterPreset
+        fields = ("name", "query")
+
+    def __init__(self, *args, user, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.instance.user = user
+
+    def clean_name(self):
+        name = self.cleaned_data["name"]
+        presets = FilterPreset.objects.filter(user=self.instance.user)
+        if presets.filter(name=name).exists():
+            raise forms.ValidationError(_("Фильтр с таким названием уже есть."))
+        return name
+
+    def clean_query(self):
+        return normalize_query(self.cleaned_data["query"])
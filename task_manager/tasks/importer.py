@@ -0,0 +1,253 @@
+"""
+Bulk task import from CSV or NDJSON.
+
+Records are read lazily and written in chunks, one transaction per chunk.
+Status, user and label names are resolved through in-memory maps, so a chunk
+costs a fixed number of statements regardless of its size. The number of
+consumed records is stored in an ``ImportCheckpoint`` row in the transaction
+of every chunk, so an interrupted import resumes exactly where it stopped.
+"""
+
+import csv
+import itertools
+import json
+import os
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+
+from .counters import Delta, TaskState
+from .models import ImportCheckpoint, Task, TaskLabel
+from .presets import invalidate_tasks
+
+User = get_user_model()
+
+FORMATS = ("csv", "ndjson")
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+class ImportFileError(ValueError):
+    pass
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension in ("json", "jsonl"):
+        return "ndjson"
+    return extension if extension in FORMATS else "csv"
+
+
+def read_records(path, fmt):
+    with open(path, encoding="utf-8", newline="") as source:
+        if fmt == "csv":
+            yield from csv.DictReader(source)
+            return
+        for number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ImportFileError(
+                    f"line {number}: invalid JSON: {error.msg}"
+                ) from error
+            if not isinstance(record, dict):
+                raise ImportFileError(f"line {number}: expected an object")
+            yield record
+
+
+def chunked(records, size):
+    iterator = iter(records)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def split_labels(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(";")
+    return [name.strip() for name in value if name and name.strip()]
+
+
+class Checkpoint:
+    def __init__(self, key):
+        self.key = key
+
+    def load(self):
+        records = ImportCheckpoint.objects.filter(key=self.key).values_list(
+            "records", flat=True
+        )
+        return records.first() or 0
+
+    def save(self, records):
+        ImportCheckpoint.objects.update_or_create(
+            key=self.key, defaults={"records": records}
+        )
+
+    def clear(self):
+        ImportCheckpoint.objects.filter(key=self.key).delete()
+
+
+@dataclass
+class ChunkResult:
+    created: int = 0
+    errors: list = field(default_factory=list)
+
+
+class TaskImporter:
+    def __init__(
+        self, default_author=None, create_missing=False, use_copy=None
+    ):
+        self.default_author = default_author
+        self.create_missing = create_missing
+        if use_copy is None:
+            use_copy = connection.vendor == "postgresql"
+        self.use_copy = use_copy
+        self.statuses = dict(Status.objects.values_list("name", "id"))
+        self.closed_statuses = set(
+            Status.objects.filter(is_closed=True).values_list("id", flat=True)
+        )
+        self.labels = dict(Label.objects.values_list("name", "id"))
+        self.users = dict(User.objects.values_list("username", "id"))
+
+    def _resolve(self, mapping, model, name, kind):
+        if name in mapping:
+            return mapping[name]
+        if not self.create_missing:
+            raise ImportRowError(f"unknown {kind} {name!r}")
+        mapping[name] = model.objects.get_or_create(name=name)[0].id
+        return mapping[name]
+
+    def _user(self, username, kind):
+        if username not in self.users:
+            raise ImportRowError(f"unknown {kind} {username!r}")
+        return self.users[username]
+
+    def build_row(self, record):
+        name = (record.get("name") or "").strip()
+        if not name:
+            raise ImportRowError("name is required")
+        status = (record.get("status") or "").strip()
+        if not status:
+            raise ImportRowError("status is required")
+        author = (record.get("author") or "").strip() or self.default_author
+        if not author:
+            raise ImportRowError("author is required")
+        executor = (record.get("executor") or "").strip()
+
+        row = {
+            "name": name,
+            "description": record.get("description") or "",
+            "status_id": self._resolve(self.statuses, Status, status, "status"),
+            "author_id": self._user(author, "author"),
+            "executor_id": self._user(executor, "executor")
+            if executor
+            else None,
+        }
+        label_ids = {
+            self._resolve(self.labels, Label, label, "label")
+            for label in split_labels(record.get("labels"))
+        }
+        return row, sorted(label_ids)
+
+    def import_chunk(self, records, first_number, checkpoint=None):
+        result = ChunkResult()
+        rows = []
+        known = dict(self.statuses), dict(self.labels)
+        try:
+            with transaction.atomic():
+                # Статусы и метки из --create-missing создаются вместе с пакетом
+                for number, record in enumerate(records, start=first_number):
+                    try:
+                        rows.append(self.build_row(record))
+                    except ImportRowError as error:
+                        result.errors.append((number, str(error)))
+
+                if self.use_copy:
+                    self._copy(rows)
+                else:
+                    self._bulk_create(rows)
+                self._count(rows)
+                if rows:
+                    invalidate_tasks()
+                if checkpoint is not None:
+                    checkpoint.save(first_number + len(records) - 1)
+        except Exception:
+            # id из откаченной транзакции не существуют
+            self.statuses, self.labels = known
+            raise
+        result.created = len(rows)
+        return result
+
+    def _bulk_create(self, rows):
+        tasks = Task.objects.bulk_create(Task(**row) for row, _ in rows)
+        TaskLabel.objects.bulk_create(
+            (
+                TaskLabel(task_id=task.id, label_id=label_id)
+                for task, (_, label_ids) in zip(tasks, rows, strict=True)
+                for label_id in label_ids
+            ),
+            ignore_conflicts=True,
+        )
+
+    def _count(self, rows):
+        # Массовая вставка идет мимо сигналов — счетчики обновляем сами
+        delta = Delta()
+        today = timezone.localdate()
+        for row, label_ids in rows:
+            state = TaskState(
+                row["status_id"],
+                row["status_id"] not in self.closed_statuses,
+                row["author_id"],
+                row["executor_id"],
+                tuple(label_ids),
+                created_on=today,
+            )
+            delta.add_task(state, 1)
+        delta.apply()
+
+    def _copy(self, rows):
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            # id нужны заранее, чтобы сразу записать связи с метками
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence('tasks_task', 'id')) "
+                "FROM generate_series(1, %s)",
+                [len(rows)],
+            )
+            ids = [task_id for (task_id,) in cursor.fetchall()]
+
+            with cursor.copy(
+                "COPY tasks_task (id, name, description, status_id, "
+                "author_id, executor_id, created_at, updated_at) FROM STDIN"
+            ) as copy:
+                for task_id, (row, _) in zip(ids, rows, strict=True):
+                    copy.write_row(
+                        (
+                            task_id,
+                            row["name"],
+                            row["description"],
+                            row["status_id"],
+                            row["author_id"],
+                            row["executor_id"],
+                            now,
+                            now,
+                        )
+                    )
+
+            with cursor.copy(
+                "COPY tasks_tasklabel (task_id, label_id, created_at) "
+                "FROM STDIN"
+            ) as copy:
+                for task_id, (_, label_ids) in zip(ids, rows, strict=True):
+                    for label_id in label_ids:
+                        copy.write_row((task_id, label_id, now))
@@ -0,0 +1,46 @@
+"""
+Set the labels of a task by the difference with the stored links.
+
+One SELECT reads the current label ids, one INSERT adds the new links
+(``ignore_conflicts`` against ``unique_task_label``) and one DELETE drops
+the removed ones; links that stay are not touched and keep their
+``created_at``. The bulk statements bypass ``m2m_changed``, so the label
+counters get their ``Delta``, the ``tasks`` cache version is bumped and the
+``updated`` task event is published here.
+"""
+
+from django.db import transaction
+
+from .counters import Delta
+from .events import on_commit_publish
+from .models import TaskLabel
+from .presets import invalidate_tasks
+
+
+def sync_labels(task, labels):
+    wanted = {getattr(label, "pk", label) for label in labels}
+    with transaction.atomic():
+        current = set(
+            TaskLabel.objects.filter(task=task).values_list(
+                "label_id", flat=True
+            )
+        )
+        added, removed = wanted - current, current - wanted
+        if added:
+            TaskLabel.objects.bulk_create(
+                (TaskLabel(task=task, label_id=pk) for pk in added),
+                ignore_conflicts=True,
+            )
+        if removed:
+            TaskLabel.objects.filter(task=task, label_id__in=removed).delete()
+
+        delta = Delta()
+        is_open = not task.status.is_closed
+        delta.add_labels(added, is_open, 1)
+        delta.add_labels(removed, is_open, -1)
+        delta.apply()
+        if added or removed:
+            invalidate_tasks()
+            # Событие save() ушло до записи меток, в нем старый набор
+            on_commit_publish("updated", [task.pk])
+    return added, removed
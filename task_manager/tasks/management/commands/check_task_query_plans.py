@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.tasks.query_plans import check_task_list_plans
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the task list query for every TaskFilter combination and "
+        "fail if any table is read with a sequential scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--show-plans",
+            action="store_true",
+            help="Print the full plan for every combination.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            results = check_task_list_plans()
+        except ValueError as error:
+            raise CommandError(str(error)) from error
+
+        failed = 0
+        for names, plan, seq_scans in results:
+            label = " + ".join(names) or "(no filters)"
+            if seq_scans:
+                failed += 1
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"{label}: sequential scan on {', '.join(seq_scans)}"
+                    )
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{label}: ok"))
+            if options["show_plans"] or seq_scans:
+                self.stdout.write(plan)
+
+        if failed:
+            raise CommandError(f"{failed} query plan(s) use sequential scans")
@@ -0,0 +1,103 @@
+import itertools
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.tasks.importer import (
+    FORMATS,
+    Checkpoint,
+    ImportFileError,
+    TaskImporter,
+    chunked,
+    detect_format,
+    read_records,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks from a CSV or NDJSON file. Columns: name, description, "
+        "status, author, executor (usernames), labels (separated by ';' in "
+        "CSV or a list in NDJSON)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--author",
+            help="Username used when a record has no author.",
+        )
+        parser.add_argument(
+            "--create-missing",
+            action="store_true",
+            help="Create unknown statuses and labels instead of skipping.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip records already committed by a previous run.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint name (default: absolute path of the file).",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create even on Postgres.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or detect_format(path)
+        checkpoint = Checkpoint(options["checkpoint"] or os.path.abspath(path))
+        skip = checkpoint.load() if options["resume"] else 0
+
+        importer = TaskImporter(
+            default_author=options["author"],
+            create_missing=options["create_missing"],
+            use_copy=False if options["no_copy"] else None,
+        )
+        mode = "COPY" if importer.use_copy else "bulk_create"
+        self.stdout.write(f"Importing {path} ({fmt}, {mode})")
+        if skip:
+            self.stdout.write(f"Resuming after record {skip}")
+
+        if not os.path.isfile(path):
+            raise CommandError(f"File not found: {path}")
+        records = itertools.islice(read_records(path, fmt), skip, None)
+
+        consumed, created, failed = skip, 0, 0
+        started = time.monotonic()
+        try:
+            for chunk in chunked(records, options["batch_size"]):
+                result = importer.import_chunk(
+                    chunk, first_number=consumed + 1, checkpoint=checkpoint
+                )
+                consumed += len(chunk)
+                created += result.created
+                failed += len(result.errors)
+
+                for number, error in result.errors:
+                    self.stderr.write(f"record {number}: {error}")
+                elapsed = max(time.monotonic() - started, 1e-9)
+                self.stdout.write(
+                    f"{consumed} records, {created} tasks created "
+                    f"({created / elapsed:.0f} tasks/s)"
+                )
+        except ImportFileError as error:
+            # Записи до ошибки сохранены — после исправления нужен --resume
+            raise CommandError(f"{path}: {error}") from error
+
+        checkpoint.clear()
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {created} tasks created, {failed} skipped "
+                f"in {elapsed:.1f}s ({created / elapsed:.0f} "
+                "tasks/s)"
+            )
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from task_manager.tasks.counters import recount
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute task counters of statuses, labels and user profiles "
+        "from the tasks table and fix the rows that drifted."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixed = recount()
+        for name, count in fixed.items():
+            self.stdout.write(f"{name}: {count} fixed")
+        self.stdout.write(self.style.SUCCESS("Task counters are up to date"))
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("labels", "0001_initial"),
+        ("statuses", "0001_initial"),
+        ("tasks", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="task_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="task_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["executor", "-created_at", "-id"],
+                name="task_executor_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="task_author_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tasklabel",
+            index=models.Index(
+                fields=["label", "task"], name="tasklabel_label_task_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,94 @@
+from django.db import migrations
+
+# Копия SQL из task_manager.tasks.search на момент миграции: миграция
+# не должна зависеть от того, как модуль поиска изменится потом
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts USING fts5(
+        name,
+        description,
+        content='tasks_task',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ai AFTER INSERT ON tasks_task
+    BEGIN
+        INSERT INTO tasks_task_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ad AFTER DELETE ON tasks_task
+    BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_au
+    AFTER UPDATE OF name, description ON tasks_task
+    BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO tasks_task_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS tasks_task_fts_ai",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_ad",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_au",
+    "DROP TABLE IF EXISTS tasks_task_fts",
+]
+
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE tasks_task ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS task_search_vector_idx
+    ON tasks_task USING GIN (search_vector)
+    """,
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS task_search_vector_idx",
+    "ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector",
+]
+
+STATEMENTS = {
+    "postgresql": (POSTGRES_INSTALL, POSTGRES_UNINSTALL),
+    "sqlite": (SQLITE_INSTALL, SQLITE_UNINSTALL),
+}
+
+
+def install(apps, schema_editor):
+    statements, _ = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def uninstall(apps, schema_editor):
+    _, statements = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0002_task_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+# Копия пересчета из task_manager.tasks.counters на момент миграции
+
+
+def _count(queryset, field):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def _recount(queryset, **counts):
+    drifted = Q()
+    for field, value in counts.items():
+        drifted |= ~Q(**{field: value})
+    queryset.filter(drifted).update(**counts)
+
+
+def fill_counters(apps, schema_editor):
+    Status = apps.get_model("statuses", "Status")
+    Label = apps.get_model("labels", "Label")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Profile = apps.get_model("users", "Profile")
+    Task = apps.get_model("tasks", "Task")
+    TaskLabel = apps.get_model("tasks", "TaskLabel")
+
+    tasks = Task.objects.all()
+    open_tasks = tasks.filter(status__is_closed=False)
+    links = TaskLabel.objects.all()
+
+    _recount(Status.objects.all(), tasks_count=_count(tasks, "status"))
+    _recount(
+        Label.objects.all(),
+        tasks_count=_count(links, "label"),
+        open_tasks_count=_count(
+            links.filter(task__status__is_closed=False), "label"
+        ),
+    )
+
+    Profile.objects.bulk_create(
+        (
+            Profile(user_id=pk)
+            for pk in User.objects.values_list("pk", flat=True)
+        ),
+        ignore_conflicts=True,
+    )
+    _recount(
+        Profile.objects.all(),
+        authored_tasks_count=_count(tasks, "author"),
+        assigned_tasks_count=_count(tasks, "executor"),
+        open_assigned_tasks_count=_count(open_tasks, "executor"),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("labels", "0002_label_task_counters"),
+        ("statuses", "0002_status_is_closed_task_counters"),
+        ("tasks", "0003_task_search_index"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
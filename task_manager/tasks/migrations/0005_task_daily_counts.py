@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0004_recount_task_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskDailyCount",
+            fields=[
+                (
+                    "day",
+                    models.DateField(
+                        primary_key=True, serialize=False, verbose_name="Day"
+                    ),
+                ),
+                (
+                    "created_count",
+                    models.IntegerField(default=0, editable=False),
+                ),
+            ],
+            options={
+                "verbose_name": "Tasks created per day",
+                "verbose_name_plural": "Tasks created per day",
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+# Копия recount_days из task_manager.tasks.counters на момент миграции
+
+
+def fill_daily_counts(apps, schema_editor):
+    TaskDailyCount = apps.get_model("tasks", "TaskDailyCount")
+    Task = apps.get_model("tasks", "Task")
+    actual = dict(
+        Task.objects.order_by()
+        .values_list(TruncDate("created_at"))
+        .annotate(count=Count("pk"))
+    )
+    stored = dict(TaskDailyCount.objects.values_list("day", "created_count"))
+    drifted = [
+        TaskDailyCount(day=day, created_count=actual.get(day, 0))
+        for day in actual.keys() | stored.keys()
+        if actual.get(day, 0) != stored.get(day)
+    ]
+    TaskDailyCount.objects.bulk_create(
+        drifted,
+        update_conflicts=True,
+        unique_fields=["day"],
+        update_fields=["created_count"],
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0007_import_checkpoints"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_daily_counts, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,5 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from task_manager.labels.models import Label
@@ -48,9 +48,46 @@ class Task(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Счетчики задач (tasks/counters.py) меняются в той же транзакции
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _("Task")
         verbose_name_plural = _("Tasks")
+        # Под порядок списка (-created_at, -id) и фильтры TaskFilter
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="task_created_idx",
+            ),
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="task_status_created_idx",
+            ),
+            models.Index(
+                fields=["executor", "-created_at", "-id"],
+                name="task_executor_created_idx",
+            ),
+            models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="task_author_created_idx",
+            ),
+        ]
+
+
+class TaskDailyCount(models.Model):
+    day = models.DateField(primary_key=True, verbose_name=_("Day"))
+    # Поддерживается task_manager.tasks.counters
+    created_count = models.IntegerField(default=0, editable=False)
+
+    def __str__(self):
+        return f"{self.day}: {self.created_count}"
+
+    class Meta:
+        verbose_name = _("Tasks created per day")
+        verbose_name_plural = _("Tasks created per day")
 
 
 class TaskLabel(models.Model):
@@ -75,3 +112,50 @@ class TaskLabel(models.Model):
                 name="unique_task_label",
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["label", "task"],
+                name="tasklabel_label_task_idx",
+            ),
+        ]
+
+
+class ImportCheckpoint(models.Model):
+    # Имя импорта: путь к файлу или значение --checkpoint
+    key = models.CharField(max_length=255, unique=True)
+    records = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key}: {self.records}"
+
+    class Meta:
+        verbose_name = _("Import checkpoint")
+        verbose_name_plural = _("Import checkpoints")
+
+
+class FilterPreset(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="filter_presets",
+        verbose_name=_("User"),
+    )
+    name = models.CharField(max_length=100, verbose_name=_("Name"))
+    # Параметры TaskFilter в виде строки запроса списка задач
+    query = models.CharField(max_length=1000, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = _("Filter preset")
+        verbose_name_plural = _("Filter presets")
+        ordering = ["name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "name"],
+                name="unique_filter_preset_name",
+            )
+        ]
@@ -0,0 +1,82 @@
+"""
+Saved filter presets of the task list and their cached result counts.
+
+A count is cached under the version token of the ``tasks`` namespace, which
+is bumped by every write to tasks and their labels. A list page reads the
+counts of all presets with one ``get_many``; a preset is counted again only
+when the token has changed since its count was stored.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import QueryDict
+
+from task_manager.cache_versions import bump_version, get_version, is_shared
+
+from .counters import unless_suspended
+from .filters import TaskFilter
+from .models import FilterPreset, Task
+
+TASKS_NAMESPACE = "tasks"
+TIMEOUT = 24 * 60 * 60
+
+
+def normalize_query(query):
+    """Keep the non-empty TaskFilter parameters in a stable order."""
+    params = QueryDict(query)
+    result = QueryDict(mutable=True)
+    for name in sorted(TaskFilter.base_filters):
+        values = [value for value in params.getlist(name) if value]
+        if values:
+            result.setlist(name, values)
+    return result.urlencode()
+
+
+def count_tasks(query, request):
+    filterset = TaskFilter(
+        QueryDict(query),
+        queryset=Task.objects.all(),
+        request=request,
+        load_choices=False,
+    )
+    if not filterset.is_valid():
+        # Статус, метка или пользователь из пресета уже удалены
+        return None
+    return filterset.qs.order_by().count()
+
+
+def load_presets(request):
+    """The user's presets with a ``count`` attribute."""
+    presets = list(FilterPreset.objects.filter(user=request.user))
+    if not presets:
+        return presets
+    if not is_shared():
+        for preset in presets:
+            preset.count = count_tasks(preset.query, request)
+        return presets
+
+    version = get_version(TASKS_NAMESPACE)
+    keys = {
+        preset: f"{TASKS_NAMESPACE}:preset_count:{preset.pk}:{version}"
+        for preset in presets
+    }
+    cached = cache.get_many(keys.values())
+    missing = {}
+    for preset, key in keys.items():
+        if key in cached:
+            preset.count = cached[key]
+        else:
+            preset.count = missing[key] = count_tasks(preset.query, request)
+    if missing:
+        cache.set_many(missing, TIMEOUT)
+    return presets
+
+
+@unless_suspended
+def invalidate_tasks(sender=None, action=None, **kwargs):
+    # m2m_changed приходит и до, и после изменения связей
+    if action is not None and not action.startswith("post_"):
+        return
+    # И после коммита: параллельный запрос мог успеть посчитать старые строки
+    bump_version(TASKS_NAMESPACE)
+    transaction.on_commit(lambda: bump_version(TASKS_NAMESPACE))
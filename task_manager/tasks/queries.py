@@ -0,0 +1,29 @@
+from django.db.models import Prefetch
+
+from task_manager.labels.models import Label
+
+from .models import Task
+
+LABELS_ATTR = "label_list"
+
+
+def with_labels(queryset):
+    """Load labels of all tasks in one query into ``task.label_list``."""
+    return queryset.prefetch_related(
+        Prefetch(
+            "labels",
+            queryset=Label.objects.order_by("name"),
+            to_attr=LABELS_ATTR,
+        )
+    )
+
+
+def task_queryset():
+    """Tasks with everything the list, detail and export pages display."""
+    return with_labels(
+        Task.objects.select_related(
+            "author",
+            "executor",
+            "status",
+        )
+    )
@@ -0,0 +1,113 @@
+import itertools
+import re
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import RequestFactory
+
+from task_manager.labels.models import Label
+from task_manager.pagination import KeysetPaginator
+from task_manager.statuses.models import Status
+
+from .filters import TaskFilter
+from .search import RANK
+from .views import TaskListView
+
+User = get_user_model()
+
+FILTER_NAMES = ("status", "executor", "label", "self_tasks", "q")
+
+# SQLite: "SCAN tasks_task" без "USING ... INDEX" (поиск FTS5 — это
+# "SCAN ... VIRTUAL TABLE INDEX"); Postgres: "Seq Scan on"
+SQLITE_SEQ_SCAN = re.compile(
+    r"\bSCAN (?!.*\b(?:USING\b.*\bINDEX|VIRTUAL TABLE)\b)(\w+)"
+)
+POSTGRES_SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def filter_combinations():
+    for size in range(len(FILTER_NAMES) + 1):
+        yield from itertools.combinations(FILTER_NAMES, size)
+
+
+def _filter_params(names, status, executor, label):
+    values = {
+        "status": status.pk,
+        "executor": executor.pk,
+        "label": label.pk,
+        "self_tasks": "on",
+        "q": "task",
+    }
+    return {name: values[name] for name in names}
+
+
+def task_list_querysets(names, status, executor, label, user):
+    """First page and a seek page of the task list for the given filters."""
+    params = _filter_params(names, status, executor, label)
+    request = RequestFactory().get("/tasks/", params)
+    request.user = user
+
+    view = TaskListView(request=request)
+    filterset = TaskFilter(
+        params, queryset=view.get_queryset(), request=request
+    )
+    if not filterset.is_valid():
+        raise ValueError(f"Invalid filter params {params}: {filterset.errors}")
+
+    paginator = KeysetPaginator(
+        filterset.qs,
+        view.get_keyset_ordering(filterset.qs),
+        view.paginate_by,
+    )
+    sample = {RANK: 0.0, "created_at": datetime.now(timezone.utc), "id": 0}
+    cursor = [sample[key] for key in paginator.keys]
+    return [
+        paginator.page_queryset(),
+        paginator.page_queryset(cursor),
+    ]
+
+
+def explain(queryset):
+    if connection.vendor == "postgresql":
+        # Иначе планировщик выбирает Seq Scan на маленьких таблицах
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            return queryset.explain()
+    return queryset.explain()
+
+
+def sequential_scans(plan):
+    pattern = (
+        POSTGRES_SEQ_SCAN
+        if connection.vendor == "postgresql"
+        else SQLITE_SEQ_SCAN
+    )
+    return pattern.findall(plan)
+
+
+def check_task_list_plans(status=None, executor=None, label=None, user=None):
+    """
+    EXPLAIN the task list query for every TaskFilter combination.
+
+    Returns (names, plan, seq_scans) tuples; seq_scans lists tables that are
+    read without an index.
+    """
+    status = status or Status.objects.order_by("pk").first()
+    executor = executor or User.objects.order_by("pk").first()
+    label = label or Label.objects.order_by("pk").first()
+    user = user or executor
+    if not (status and executor and label):
+        raise ValueError(
+            "EXPLAIN needs at least one status, user and label in the database"
+        )
+
+    results = []
+    for names in filter_combinations():
+        for queryset in task_list_querysets(
+            names, status, executor, label, user
+        ):
+            plan = explain(queryset)
+            results.append((names, plan, sequential_scans(plan)))
+    return results
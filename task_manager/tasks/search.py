@@ -0,0 +1,151 @@
+"""
+Full-text search over task name and description.
+
+Postgres keeps a generated ``tsvector`` column with a GIN index, SQLite keeps
+an external-content FTS5 table in sync with triggers. Neither column is known
+to the Django model, so migration 0003 creates the index from a frozen copy
+of the statements below. A migration that makes SQLite rebuild ``tasks_task``
+drops the triggers and has to run its own copy of them again.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+RANK = "search_rank"
+
+SQLITE_TABLE = "tasks_task_fts"
+
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} USING fts5(
+        name,
+        description,
+        content='tasks_task',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_TABLE}_ai AFTER INSERT ON tasks_task
+    BEGIN
+        INSERT INTO {SQLITE_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_TABLE}_ad AFTER DELETE ON tasks_task
+    BEGIN
+        INSERT INTO {SQLITE_TABLE}({SQLITE_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_TABLE}_au
+    AFTER UPDATE OF name, description ON tasks_task
+    BEGIN
+        INSERT INTO {SQLITE_TABLE}({SQLITE_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {SQLITE_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"INSERT INTO {SQLITE_TABLE}({SQLITE_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {SQLITE_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {SQLITE_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {SQLITE_TABLE}_au",
+    f"DROP TABLE IF EXISTS {SQLITE_TABLE}",
+]
+
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE tasks_task ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS task_search_vector_idx
+    ON tasks_task USING GIN (search_vector)
+    """,
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS task_search_vector_idx",
+    "ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def search_terms(text):
+    return re.findall(r"\w+", text or "")
+
+
+def search(queryset, text):
+    """
+    Filter tasks matching every word of ``text`` (as a prefix) and annotate
+    them with ``search_rank``: higher is a better match.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        query = " & ".join(f"{term}:*" for term in terms)
+        tsquery = "to_tsquery('simple', %s)"
+        return queryset.annotate(
+            **{
+                RANK: RawSQL(
+                    f'ts_rank("tasks_task"."search_vector", {tsquery})',
+                    [query],
+                    output_field=FloatField(),
+                )
+            }
+        ).filter(
+            RawSQL(
+                f'"tasks_task"."search_vector" @@ {tsquery}',
+                [query],
+                output_field=BooleanField(),
+            )
+        )
+
+    if vendor == "sqlite":
+        query = " ".join(
+            '"{}"*'.format(term.replace('"', '""')) for term in terms
+        )
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {SQLITE_TABLE} "
+                f"WHERE {SQLITE_TABLE} MATCH %s",
+                [query],
+            )
+        ).annotate(
+            **{
+                # bm25: чем меньше, тем лучше — меняем знак
+                RANK: RawSQL(
+                    f"SELECT -bm25({SQLITE_TABLE}, 10.0, 1.0) "
+                    f"FROM {SQLITE_TABLE} "
+                    f"WHERE {SQLITE_TABLE} MATCH %s "
+                    f'AND rowid = "tasks_task"."id"',
+                    [query],
+                    output_field=FloatField(),
+                )
+            }
+        )
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(name__icontains=term) | Q(description__icontains=term)
+    return queryset.filter(condition).annotate(
+        **{RANK: Value(0.0, output_field=FloatField())}
+    )
+
+
+def is_ranked(queryset):
+    return RANK in queryset.query.annotations
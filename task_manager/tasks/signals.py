@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+
+from . import counters, events
+from .choices import invalidate_choices
+from .models import Task, TaskLabel
+from .presets import invalidate_tasks
+
+User = get_user_model()
+
+COUNTER_RECEIVERS = (
+    (pre_save, Task, counters.snapshot_task),
+    (post_save, Task, counters.count_saved_task),
+    (pre_delete, Task, counters.snapshot_deleted_task),
+    (post_delete, Task, counters.count_deleted_task),
+    (m2m_changed, TaskLabel, counters.count_label_links),
+    # Удаление TaskLabel намеренно без сигнала: иначе каскад от задачи
+    # посчитает метки дважды и перестанет быть быстрым DELETE
+    (post_save, TaskLabel, counters.count_created_link),
+    (pre_save, Status, counters.snapshot_status),
+    (post_save, Status, counters.recount_reopened),
+)
+
+# Версия «tasks» для кэша счетчиков пресетов. Удаление TaskLabel без
+# сигнала по той же причине: sync_labels и bulk сбрасывают версию сами
+TASKS_VERSION_SIGNALS = (
+    ("task_save", post_save, Task),
+    ("task_delete", post_delete, Task),
+    ("link_save", post_save, TaskLabel),
+    ("links_changed", m2m_changed, TaskLabel),
+)
+
+EVENT_RECEIVERS = (
+    (post_save, Task, events.publish_saved_task),
+    (post_delete, Task, events.publish_deleted_task),
+    (post_save, TaskLabel, events.publish_created_link),
+    (m2m_changed, TaskLabel, events.publish_label_links),
+)
+
+
+def connect_signals():
+    for model in (Status, Label, User):
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate_choices,
+                sender=model,
+                dispatch_uid=f"task_choices_{model._meta.label_lower}",
+            )
+
+    for signal, model, receiver in COUNTER_RECEIVERS:
+        signal.connect(
+            receiver,
+            sender=model,
+            dispatch_uid=f"task_counters_{receiver.__name__}",
+        )
+
+    for name, signal, model in TASKS_VERSION_SIGNALS:
+        signal.connect(
+            invalidate_tasks,
+            sender=model,
+            dispatch_uid=f"tasks_version_{name}",
+        )
+
+    for signal, model, receiver in EVENT_RECEIVERS:
+        signal.connect(
+            receiver,
+            sender=model,
+            dispatch_uid=f"task_events_{receiver.__name__}",
+        )
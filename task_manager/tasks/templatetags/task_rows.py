@@ -0,0 +1,35 @@
+from django import template
+from django.utils import timezone, translation
+
+register = template.Library()
+
+
+def _stamp(value):
+    return value.isoformat() if value else ""
+
+
+@register.simple_tag
+def task_row_key(task):
+    """
+    Everything a cached task row depends on.
+
+    Any edit of the task, its status or labels moves ``updated_at`` and so
+    the key; users have no ``updated_at``, so their displayed username is
+    part of the key instead.
+    """
+    labels = ",".join(
+        f"{label.id}:{_stamp(label.updated_at)}" for label in task.label_list
+    )
+    return "|".join(
+        (
+            str(task.id),
+            _stamp(task.updated_at),
+            str(task.status_id),
+            _stamp(task.status.updated_at),
+            task.author.username,
+            task.executor.username if task.executor else "",
+            labels,
+            translation.get_language() or "",
+            timezone.get_current_timezone_name(),
+        )
+    )
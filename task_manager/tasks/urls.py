@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path(
@@ -8,6 +8,46 @@ urlpatterns = [
         views.TaskListView.as_view(),
         name="tasks_list",
     ),
+    path(
+        "async/",
+        async_views.AsyncTaskListView.as_view(),
+        name="tasks_list_async",
+    ),
+    path(
+        "events/",
+        async_views.TaskEventsView.as_view(),
+        name="task_events",
+    ),
+    path(
+        "bulk/",
+        views.TaskBulkView.as_view(),
+        name="tasks_bulk",
+    ),
+    path(
+        "presets/create/",
+        views.FilterPresetCreateView.as_view(),
+        name="filter_preset_create",
+    ),
+    path(
+        "presets/<int:pk>/delete/",
+        views.FilterPresetDeleteView.as_view(),
+        name="filter_preset_delete",
+    ),
+    path(
+        "export/",
+        views.TaskExportView.as_view(),
+        name="tasks_export",
+    ),
+    path(
+        "autocomplete/executors/",
+        views.ExecutorAutocompleteView.as_view(),
+        name="autocomplete_executors",
+    ),
+    path(
+        "autocomplete/labels/",
+        views.LabelAutocompleteView.as_view(),
+        name="autocomplete_labels",
+    ),
     path(
         "create/",
         views.TaskCreateView.as_view(),
@@ -23,6 +63,11 @@ urlpatterns = [
         views.TaskDeleteView.as_view(),
         name="task_delete",
     ),
+    path(
+        "<int:pk>/async/",
+        async_views.AsyncTaskDetailView.as_view(),
+        name="task_detail_async",
+    ),
     path(
         "<int:pk>/",
         views.TaskDetailView.as_view(),
@@ -1,29 +1,286 @@
+import csv
+import json
+
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db.models import Count, Max
+from django.http import (
+    Http404,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import redirect
-from django.urls import reverse_lazy
-from django.views.generic import CreateView, DeleteView, DetailView, UpdateView
+from django.urls import reverse, reverse_lazy
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.generic import (
+    CreateView,
+    DeleteView,
+    DetailView,
+    UpdateView,
+    View,
+)
 from django_filters.views import FilterView
 
-from task_manager.tasks.models import Task
+from task_manager.cache_versions import get_version, is_shared
+from task_manager.conditional import ConditionalGetMixin
+from task_manager.pagination import KeysetPaginationMixin
+from task_manager.tasks.models import FilterPreset, Task
 
+from . import bulk, events
+from .autocomplete import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    search_labels,
+    search_users,
+)
+from .choices import NAMESPACE, user_display_name
 from .filters import TaskFilter
-from .forms import TaskForm
+from .forms import FilterPresetForm, TaskBulkForm, TaskForm
+from .presets import TASKS_NAMESPACE, load_presets, normalize_query
+from .queries import task_queryset
+from .search import RANK, is_ranked
 
 
-class TaskListView(LoginRequiredMixin, FilterView):
+class TaskListView(
+    LoginRequiredMixin, ConditionalGetMixin, KeysetPaginationMixin, FilterView
+):
     model = Task
     template_name = "task_manager/tasks/tasks.html"
     context_object_name = "tasks"
     login_url = reverse_lazy("login")
     filterset_class = TaskFilter
+    paginate_by = 50
+    ordering = ("-created_at", "-id")
+    read_from_replica = True
 
     def get_queryset(self):
-        return Task.objects.select_related(
-            "author",
-            "executor",
-            "status",
+        return task_queryset()
+
+    def get_validator_parts(self):
+        filterset = self.get_filterset(self.get_filterset_class())
+        if filterset.is_bound and not filterset.is_valid():
+            return None
+        return self.list_validator_parts(filterset.qs, self.request.user)
+
+    @staticmethod
+    def list_validator_parts(queryset, user):
+        # Версии справочников ниже видны всем воркерам только в общем кеше
+        if not is_shared():
+            return None
+        state = queryset.order_by().aggregate(
+            last_modified=Max("updated_at"), count=Count("id")
+        )
+        # Версия справочников меняется при правке статусов, меток и
+        # пользователей, которые видны в строках и в форме фильтра
+        parts = [state["last_modified"], state["count"], get_version(NAMESPACE)]
+        presets = list(
+            FilterPreset.objects.filter(user=user).values_list("pk", "name")
+        )
+        if presets:
+            # Счетчики пресетов зависят от всех задач, а не от этой выборки
+            parts += [presets, get_version(TASKS_NAMESPACE)]
+        return parts, state["last_modified"]
+
+    def get_keyset_ordering(self, queryset):
+        ordering = self.get_ordering()
+        if is_ranked(queryset):
+            ordering = (f"-{RANK}", *ordering)
+        return ordering
+
+    def get_context_data(self, **kwargs):
+        kwargs.setdefault("bulk_form", TaskBulkForm())
+        kwargs.setdefault("presets", load_presets(self.request))
+        kwargs.setdefault("events_enabled", events.enabled())
+        kwargs.setdefault("events_last_id", events.hub.last_id)
+        return super().get_context_data(**kwargs)
+
+
+class Echo:
+    # csv.writer пишет в «файл», а мы сразу отдаем строку в поток
+    def write(self, value):
+        return value
+
+
+class TaskExportView(TaskListView):
+    """
+    Stream the filtered task list as CSV or NDJSON.
+
+    Rows are read with a chunked iterator; labels are prefetched once per
+    chunk, so memory use does not depend on the number of tasks.
+    """
+
+    chunk_size = 2000
+    columns = (
+        "id",
+        "name",
+        "description",
+        "status",
+        "author",
+        "executor",
+        "labels",
+        "created_at",
+    )
+    formats = {
+        "csv": "text/csv; charset=utf-8",
+        "ndjson": "application/x-ndjson",
+    }
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get("format", "csv")
+        if export_format not in self.formats:
+            return HttpResponseBadRequest("Unknown export format")
+
+        self.filterset = self.get_filterset(self.get_filterset_class())
+        if self.filterset.is_bound and not self.filterset.is_valid():
+            return HttpResponseBadRequest("Invalid filter")
+
+        queryset = self.filterset.qs
+        queryset = queryset.order_by(*self.get_keyset_ordering(queryset))
+        # Строки читаются после выхода из middleware — база задается явно
+        queryset = queryset.using(queryset.db)
+        rows = (
+            self.get_row(task)
+            for task in queryset.iterator(chunk_size=self.chunk_size)
+        )
+
+        if export_format == "csv":
+            writer = csv.writer(Echo())
+            content = (writer.writerow(row) for row in self._with_header(rows))
+        else:
+            content = (
+                json.dumps(
+                    dict(zip(self.columns, row, strict=True)),
+                    ensure_ascii=False,
+                )
+                + "\n"
+                for row in rows
+            )
+
+        response = StreamingHttpResponse(
+            content, content_type=self.formats[export_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tasks.{export_format}"'
+        )
+        return response
+
+    def _with_header(self, rows):
+        yield self.columns
+        yield from rows
+
+    def get_row(self, task):
+        return (
+            task.id,
+            task.name,
+            task.description,
+            task.status.name,
+            user_display_name(task.author),
+            user_display_name(task.executor) if task.executor else "",
+            "; ".join(label.name for label in task.label_list),
+            task.created_at.isoformat(),
+        )
+
+
+class TaskBulkView(LoginRequiredMixin, View):
+    """Apply one action to the tasks selected on the list page."""
+
+    http_method_names = ["post"]
+    login_url = reverse_lazy("login")
+
+    def post(self, request, *args, **kwargs):
+        form = TaskBulkForm(request.POST)
+        if not form.is_valid():
+            messages.error(request, "Выберите задачи и параметры действия")
+            return self.redirect_back()
+
+        data = form.cleaned_data
+        task_ids = [task.pk for task in data["tasks"]]
+        count = bulk.run(
+            data["action"],
+            task_ids,
+            request.user,
+            status=data["status"],
+            executor=data["executor"],
+            label=data["label"],
         )
+        if data["action"] == "delete":
+            messages.success(request, f"Удалено задач: {count}")
+            if count < len(task_ids):
+                messages.error(
+                    request,
+                    "Задачу может удалить только ее автор, пропущено: "
+                    f"{len(task_ids) - count}",
+                )
+        else:
+            messages.success(request, f"Изменено задач: {count}")
+        return self.redirect_back()
+
+    def redirect_back(self):
+        # Возвращаемся на ту же страницу списка с теми же фильтрами
+        url = self.request.POST.get("next")
+        if not url_has_allowed_host_and_scheme(
+            url,
+            allowed_hosts={self.request.get_host()},
+            require_https=self.request.is_secure(),
+        ):
+            url = reverse("tasks_list")
+        return redirect(url)
+
+
+class FilterPresetCreateView(LoginRequiredMixin, View):
+    """Save the current filter of the task list as a preset."""
+
+    http_method_names = ["post"]
+    login_url = reverse_lazy("login")
+
+    def post(self, request, *args, **kwargs):
+        form = FilterPresetForm(request.POST, user=request.user)
+        if form.is_valid():
+            preset = form.save()
+            messages.success(request, "Фильтр сохранен")
+            query = preset.query
+        else:
+            for errors in form.errors.values():
+                messages.error(request, " ".join(errors))
+            query = normalize_query(request.POST.get("query", ""))
+        return redirect(f"{reverse('tasks_list')}?{query}")
+
+
+class FilterPresetDeleteView(LoginRequiredMixin, View):
+    http_method_names = ["post"]
+    login_url = reverse_lazy("login")
+
+    def post(self, request, pk, *args, **kwargs):
+        deleted, _ = FilterPreset.objects.filter(
+            pk=pk, user=request.user
+        ).delete()
+        if not deleted:
+            raise Http404("No filter preset found matching the query")
+        messages.success(request, "Фильтр удален")
+        return redirect("tasks_list")
+
+
+class AutocompleteView(LoginRequiredMixin, View):
+    login_url = reverse_lazy("login")
+    search = None
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            limit = DEFAULT_LIMIT
+        limit = max(1, min(limit, MAX_LIMIT))
+        text = request.GET.get("q", "").strip()
+        return JsonResponse({"results": self.search(text, limit)})
+
+
+class ExecutorAutocompleteView(AutocompleteView):
+    search = staticmethod(search_users)
+
+
+class LabelAutocompleteView(AutocompleteView):
+    search = staticmethod(search_labels)
 
 
 class TaskCreateView(LoginRequiredMixin, CreateView):
@@ -53,18 +310,32 @@ class TaskUpdateView(LoginRequiredMixin, UpdateView):
         return response
 
 
-class TaskDetailView(LoginRequiredMixin, DetailView):
+class TaskDetailView(LoginRequiredMixin, ConditionalGetMixin, DetailView):
     model = Task
     template_name = "task_manager/tasks/detail.html"
     context_object_name = "task"
     login_url = reverse_lazy("login")
+    read_from_replica = True
 
-    def get_queryset(self):
-        return Task.objects.select_related(
-            "author",
-            "executor",
-            "status",
+    def get_validator_parts(self):
+        return self.task_validator_parts(self.kwargs["pk"])
+
+    @staticmethod
+    def task_validator_parts(pk):
+        if not is_shared():
+            return None
+        state = (
+            Task.objects.filter(pk=pk)
+            .values("updated_at", "status__updated_at")
+            .first()
         )
+        if state is None:
+            return None
+        last_modified = max(state["updated_at"], state["status__updated_at"])
+        return [last_modified, get_version(NAMESPACE)], last_modified
+
+    def get_queryset(self):
+        return task_queryset()
 
 
 class TaskDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
@@ -1,11 +1,75 @@
+import asyncio
+import csv
+import datetime
+import io
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest.mock import patch
+
+import rollbar
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone, translation
 from django.utils.translation import gettext as _
+from django.views import View
+from django.views.generic import DeleteView
 
+from task_manager import rollbar_queue
+from task_manager.benchmarks import concurrency
+from task_manager.cache_versions import get_version
+from task_manager.conditional import ConditionalGetMixin
+from task_manager.database import database_settings, replica_settings
+from task_manager.db_router import PIN_COOKIE, ReplicaRouter
 from task_manager.labels.models import Label
+from task_manager.pagination import NEXT, encode_cursor
+from task_manager.rollbar_middleware import CustomRollbarNotifierMiddleware
+from task_manager.rollbar_queue import RollbarQueue
 from task_manager.statuses.models import Status
-from task_manager.tasks.models import Task
+from task_manager.tasks import bulk, counters, events
+from task_manager.tasks.async_views import TaskEventsView
+from task_manager.tasks.choices import NAMESPACE as CHOICES_NAMESPACE
+from task_manager.tasks.delete_impact import DeleteImpactMixin, capped_count
+from task_manager.tasks.events import Hub, TaskEvent, TaskMatcher
+from task_manager.tasks.forms import TaskForm
+from task_manager.tasks.importer import TaskImporter
+from task_manager.tasks.label_sync import sync_labels
+from task_manager.tasks.models import (
+    FilterPreset,
+    ImportCheckpoint,
+    Task,
+    TaskDailyCount,
+    TaskLabel,
+)
+from task_manager.tasks.queries import task_queryset
+from task_manager.tasks.query_plans import (
+    FILTER_NAMES,
+    check_task_list_plans,
+    explain,
+    sequential_scans,
+)
+from task_manager.tasks.templatetags.task_rows import task_row_key
+from task_manager.tasks.views import TaskListView
+from task_manager.timing_middleware import RequestTiming
+from task_manager.users.models import Profile
+from task_manager.users.queries import with_task_counts
 
 User = get_user_model()
 
@@ -258,3 +322,2315 @@ class LabelCRUDTest(TestCase):
         )
         self.assertRedirects(response, reverse("labels_list"))
         self.assertFalse(Label.objects.filter(id=self.label.id).exists())
+
+
+# ================= PAGINATION =================
+
+
+class TaskPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="user",
+            password="pass",
+        )
+        cls.new = Status.objects.create(name="New")
+        cls.done = Status.objects.create(name="Done")
+        for index in range(7):
+            Task.objects.create(
+                name=f"Task {index}",
+                status=cls.new if index % 2 else cls.done,
+                author=cls.user,
+            )
+        # Одинаковое время создания: порядок держится на id
+        Task.objects.update(created_at=timezone.now())
+
+    def setUp(self):
+        self.client.login(username="user", password="pass")
+        patcher = patch.object(TaskListView, "paginate_by", 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def walk(self, params):
+        seen = []
+        response = self.client.get(reverse("tasks_list"), params)
+        while True:
+            page = response.context["page_obj"]
+            seen.append([task.id for task in page])
+            if not page.has_next():
+                return seen, page
+            response = self.client.get(
+                reverse("tasks_list") + "?" + page.next_querystring
+            )
+
+    def test_pages_cover_all_tasks_once(self):
+        pages, _ = self.walk({})
+        ids = [task_id for page in pages for task_id in page]
+        expected = list(
+            Task.objects.order_by("-created_at", "-id").values_list(
+                "id", flat=True
+            )
+        )
+        self.assertEqual(ids, expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+    def test_cursor_keeps_filter(self):
+        pages, _ = self.walk({"status": self.new.id})
+        ids = [task_id for page in pages for task_id in page]
+        expected = Task.objects.filter(status=self.new).values_list(
+            "id", flat=True
+        )
+        self.assertCountEqual(ids, expected)
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get(reverse("tasks_list")).context["page_obj"]
+        second = self.client.get(
+            reverse("tasks_list") + "?" + first.next_querystring
+        ).context["page_obj"]
+        back = self.client.get(
+            reverse("tasks_list") + "?" + second.previous_querystring
+        ).context["page_obj"]
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+
+    def test_no_offset_queries(self):
+        first = self.client.get(reverse("tasks_list")).context["page_obj"]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(
+                reverse("tasks_list") + "?" + first.next_querystring
+            )
+        self.assertFalse(
+            any("OFFSET" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_invalid_cursor_shows_first_page(self):
+        response = self.client.get(reverse("tasks_list"), {"cursor": "bogus"})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context["page_obj"].has_previous())
+
+    def test_tampered_cursor_shows_first_page(self):
+        created = "2024-01-01T00:00:00+00:00"
+        cursors = [
+            ({}, [created, value]) for value in ("abc", {}, [1], None, 10**30)
+        ] + [
+            ({}, ["yesterday", 1]),
+            ({"q": "task"}, ["high", created, 1]),
+        ]
+        for name in ("tasks_list", "tasks_list_async"):
+            for params, values in cursors:
+                with self.subTest(name, values=values):
+                    response = self.client.get(
+                        reverse(name),
+                        {**params, "cursor": encode_cursor(NEXT, values)},
+                    )
+                    self.assertEqual(response.status_code, 200)
+                    page = response.context["page_obj"]
+                    self.assertFalse(page.has_previous())
+
+
+# ================= QUERY PLANS =================
+
+
+class TaskQueryPlanTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="user",
+            password="pass",
+        )
+        Status.objects.create(name="New")
+        Label.objects.create(name="Bug")
+
+    def test_every_filter_combination_uses_indexes(self):
+        results = check_task_list_plans()
+        self.assertEqual(len(results), 2 * 2 ** len(FILTER_NAMES))
+        for names, plan, seq_scans in results:
+            with self.subTest(filters=names):
+                self.assertEqual(seq_scans, [], plan)
+
+    def test_command_passes(self):
+        out = StringIO()
+        call_command("check_task_query_plans", stdout=out)
+        self.assertIn(
+            "status + executor + label + self_tasks: ok", out.getvalue()
+        )
+
+
+# ================= CACHED CHOICES =================
+
+
+@override_settings(SHARED_CACHE=True)
+class TaskChoicesCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="user",
+            password="pass",
+            first_name="John",
+            last_name="Doe",
+        )
+        Status.objects.create(name="New")
+        Label.objects.create(name="Bug")
+
+    def setUp(self):
+        self.client.login(username="user", password="pass")
+        # Пользователь сессии кешируется первым запросом — не считаем его
+        self.client.get(reverse("index"))
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries)
+
+    def test_task_list_reuses_choices(self):
+        cold = self.count_queries(reverse("tasks_list"))
+        warm = self.count_queries(reverse("tasks_list"))
+        self.assertEqual(cold - warm, 3)
+
+    def test_task_form_reuses_choices(self):
+        cold = self.count_queries(reverse("task_create"))
+        warm = self.count_queries(reverse("task_create"))
+        # Исполнители и метки формы приходят через autocomplete
+        self.assertEqual(cold - warm, 1)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_local_cache_is_not_used(self):
+        # Сброс версии в одном воркере остальные бы не увидели
+        cold = self.count_queries(reverse("tasks_list"))
+        warm = self.count_queries(reverse("tasks_list"))
+        self.assertEqual(cold, warm)
+
+    def test_choices_invalidated_on_save_and_delete(self):
+        self.client.get(reverse("tasks_list"))
+        status = Status.objects.create(name="Archived")
+        self.assertContains(self.client.get(reverse("tasks_list")), "Archived")
+
+        status.delete()
+        self.assertNotContains(
+            self.client.get(reverse("tasks_list")), "Archived"
+        )
+
+    def test_user_rename_invalidates_executor_choices(self):
+        self.assertContains(self.client.get(reverse("tasks_list")), "John Doe")
+        self.user.first_name = "Jack"
+        self.user.save()
+        self.assertContains(self.client.get(reverse("tasks_list")), "Jack Doe")
+
+    def test_choices_invalidated_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            Status.objects.create(name="Archived")
+        # Списки, закешированные до коммита, сбрасывает повторный bump
+        version = get_version(CHOICES_NAMESPACE)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_version(CHOICES_NAMESPACE), version)
+
+    def test_login_does_not_invalidate(self):
+        version = get_version(CHOICES_NAMESPACE)
+        self.client.login(username="user", password="pass")
+        self.assertEqual(get_version(CHOICES_NAMESPACE), version)
+
+    def test_submitted_ids_are_validated(self):
+        response = self.client.post(
+            reverse("task_create"),
+            {"name": "Task", "status": 999},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Task.objects.filter(name="Task").exists())
+
+
+# ================= SEARCH =================
+
+
+class TaskSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="user",
+            password="pass",
+        )
+        cls.new = Status.objects.create(name="New")
+        cls.done = Status.objects.create(name="Done")
+        cls.in_name = Task.objects.create(
+            name="Deploy backend",
+            description="Roll out the release",
+            status=cls.new,
+            author=cls.user,
+        )
+        cls.in_description = Task.objects.create(
+            name="Release notes",
+            description="Describe the backend deploy",
+            status=cls.done,
+            author=cls.user,
+        )
+        cls.unrelated = Task.objects.create(
+            name="Исправить вёрстку",
+            description="Кнопка съехала",
+            status=cls.new,
+            author=cls.user,
+        )
+
+    def setUp(self):
+        self.client.login(username="user", password="pass")
+
+    def found(self, params):
+        response = self.client.get(reverse("tasks_list"), params)
+        return [task.id for task in response.context["tasks"]]
+
+    def test_results_are_ranked(self):
+        self.assertEqual(
+            self.found({"q": "deploy"}),
+            [self.in_name.id, self.in_description.id],
+        )
+
+    def test_prefix_and_unicode_terms(self):
+        self.assertEqual(self.found({"q": "КНОП"}), [self.unrelated.id])
+        self.assertEqual(
+            self.found({"q": "back dep"}),
+            [
+                self.in_name.id,
+                self.in_description.id,
+            ],
+        )
+
+    def test_combines_with_filters(self):
+        self.assertEqual(
+            self.found({"q": "deploy", "status": self.done.id}),
+            [self.in_description.id],
+        )
+
+    def test_index_follows_updates_and_deletes(self):
+        self.in_name.name = "Rename me"
+        self.in_name.description = ""
+        self.in_name.save()
+        self.assertEqual(self.found({"q": "deploy"}), [self.in_description.id])
+
+        self.in_description.delete()
+        self.assertEqual(self.found({"q": "deploy"}), [])
+        self.assertEqual(self.found({"q": "rename"}), [self.in_name.id])
+
+    def test_ranked_results_paginate(self):
+        with patch.object(TaskListView, "paginate_by", 1):
+            first = self.client.get(reverse("tasks_list"), {"q": "deploy"})
+            page = first.context["page_obj"]
+            second = self.client.get(
+                reverse("tasks_list") + "?" + page.next_querystring
+            )
+        self.assertEqual(list(page), [self.in_name])
+        self.assertEqual(list(second.context["tasks"]), [self.in_description])
+
+    def test_query_without_words_is_ignored(self):
+        self.assertEqual(len(self.found({"q": "!!!"})), 3)
+
+
+# ================= EXPORT =================
+
+
+class TaskExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="author",
+            password="pass",
+            first_name="Ann",
+            last_name="Lee",
+        )
+        cls.executor = User.objects.create_user(
+            username="executor",
+            password="pass",
+        )
+        cls.new = Status.objects.create(name="New")
+        cls.done = Status.objects.create(name="Done")
+        cls.bug = Label.objects.create(name="bug")
+        cls.urgent = Label.objects.create(name="urgent")
+        for index in range(5):
+            task = Task.objects.create(
+                name=f"Task {index}",
+                status=cls.new if index % 2 else cls.done,
+                author=cls.user,
+                executor=cls.executor if index % 2 else None,
+            )
+            task.labels.set([cls.bug, cls.urgent])
+
+    def setUp(self):
+        self.client.login(username="author", password="pass")
+
+    def export(self, params):
+        response = self.client.get(reverse("tasks_export"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        rows = list(csv.reader(io.StringIO(self.export({"format": "csv"}))))
+        self.assertEqual(
+            rows[0][:7],
+            [
+                "id",
+                "name",
+                "description",
+                "status",
+                "author",
+                "executor",
+                "labels",
+            ],
+        )
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][1], "Task 4")
+        self.assertEqual(rows[1][4], "Ann Lee")
+        self.assertEqual(rows[1][6], "bug; urgent")
+
+    def test_ndjson_export_respects_filter(self):
+        lines = self.export(
+            {"format": "ndjson", "status": self.new.id}
+        ).splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row["name"] for row in rows], ["Task 3", "Task 1"])
+        self.assertEqual(rows[0]["executor"], "executor")
+
+    def test_labels_are_not_queried_per_row(self):
+        self.export({"format": "csv"})
+        with CaptureQueriesContext(connection) as few:
+            self.export({"format": "csv"})
+        for index in range(5, 10):
+            task = Task.objects.create(
+                name=f"Task {index}", status=self.new, author=self.user
+            )
+            task.labels.set([self.bug])
+        with CaptureQueriesContext(connection) as many:
+            self.export({"format": "csv"})
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse("tasks_export"), {"format": "xml"})
+        self.assertEqual(response.status_code, 400)
+
+
+# ================= IMPORT =================
+
+
+class ImportTasksCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="author")
+        cls.executor = User.objects.create_user(username="executor")
+        Status.objects.create(name="New")
+        Label.objects.create(name="bug")
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as target:
+            target.write(content)
+        return path
+
+    def run_import(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command("import_tasks", *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_import(self):
+        path = self.write(
+            "tasks.csv",
+            "name,description,status,author,executor,labels\n"
+            "First,Text,New,author,executor,bug\n"
+            "Second,,New,author,,\n"
+            "Broken,,Missing,author,,\n",
+        )
+        out, err = self.run_import(path, "--batch-size", "2")
+
+        self.assertIn("2 tasks created, 1 skipped", out)
+        self.assertIn("record 3: unknown status 'Missing'", err)
+        first = Task.objects.get(name="First")
+        self.assertEqual(first.executor, self.executor)
+        self.assertEqual([label.name for label in first.labels.all()], ["bug"])
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_ndjson_import_creates_missing(self):
+        path = self.write(
+            "tasks.ndjson",
+            json.dumps(
+                {"name": "Task", "status": "Review", "labels": ["bug", "ui"]}
+            )
+            + "\n",
+        )
+        self.run_import(path, "--author", "author", "--create-missing")
+
+        task = Task.objects.get(name="Task")
+        self.assertEqual(task.author, self.user)
+        self.assertEqual(task.status.name, "Review")
+        self.assertEqual(task.labels.count(), 2)
+
+    def test_resume_after_failure(self):
+        path = self.write(
+            "tasks.csv",
+            "name,status,author\n"
+            + "".join(f"Task {index},New,author\n" for index in range(5)),
+        )
+        original = TaskImporter.import_chunk
+        calls = []
+
+        def failing(importer, records, first_number, checkpoint):
+            calls.append(first_number)
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            return original(importer, records, first_number, checkpoint)
+
+        with (
+            patch.object(TaskImporter, "import_chunk", failing),
+            self.assertRaises(RuntimeError),
+        ):
+            self.run_import(path, "--batch-size", "2")
+        self.assertEqual(Task.objects.count(), 2)
+
+        out, _ = self.run_import(path, "--batch-size", "2", "--resume")
+        self.assertIn("Resuming after record 2", out)
+        self.assertEqual(
+            sorted(Task.objects.values_list("name", flat=True)),
+            [f"Task {index}" for index in range(5)],
+        )
+
+    def test_checkpoint_commits_with_chunk(self):
+        path = self.write(
+            "tasks.ndjson",
+            "".join(
+                json.dumps({"name": f"Task {index}", "status": status}) + "\n"
+                for index, status in enumerate(["Review"] * 2 + ["Done"] * 2)
+            ),
+        )
+        original = TaskImporter._count
+        calls = []
+
+        def failing(importer, rows):
+            calls.append(rows)
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            original(importer, rows)
+
+        args = (path, "--batch-size", "2", "--author", "author")
+        with (
+            patch.object(TaskImporter, "_count", failing),
+            self.assertRaises(RuntimeError),
+        ):
+            self.run_import(*args, "--create-missing")
+        # Задачи, статус и отметка второго пакета откатились вместе
+        self.assertEqual(ImportCheckpoint.objects.get().records, 2)
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertTrue(Status.objects.filter(name="Review").exists())
+        self.assertFalse(Status.objects.filter(name="Done").exists())
+
+        out, _ = self.run_import(*args, "--create-missing", "--resume")
+        self.assertIn("Resuming after record 2", out)
+        self.assertEqual(Task.objects.count(), 4)
+
+    def test_invalid_json_line(self):
+        path = self.write(
+            "tasks.ndjson",
+            json.dumps({"name": "Task", "status": "New"}) + "\n\n{broken\n",
+        )
+        with self.assertRaisesMessage(CommandError, "line 3: invalid JSON"):
+            self.run_import(path, "--author", "author", "--batch-size", "1")
+        self.assertEqual(ImportCheckpoint.objects.get().records, 1)
+
+        path = self.write("list.ndjson", "[1, 2]\n")
+        with self.assertRaisesMessage(CommandError, "expected an object"):
+            self.run_import(path, "--author", "author")
+
+
+# ================= TIMING =================
+
+
+class RequestTimingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="user",
+            password="pass",
+        )
+
+    def setUp(self):
+        self.client.login(username="user", password="pass")
+
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("tasks_list"))
+        header = response["Server-Timing"]
+        self.assertIn(f'desc="{len(queries.captured_queries)} queries"', header)
+        for metric in ("db;dur=", "view;dur=", "render;dur=", "total;dur="):
+            self.assertIn(metric, header)
+        self.assertEqual(len(response["X-Trace-Id"]), 32)
+
+    def test_structured_log_line(self):
+        with self.assertLogs("task_manager.timing", level="INFO") as logs:
+            response = self.client.get(reverse("tasks_list"))
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["path"], reverse("tasks_list"))
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["trace_id"], response["X-Trace-Id"])
+        self.assertGreater(record["queries"], 0)
+
+    def test_rollbar_payload_uses_request_timing(self):
+        request = RequestFactory().get("/")
+        request.timing = RequestTiming()
+        request.timing.queries = 3
+        middleware = CustomRollbarNotifierMiddleware.__new__(
+            CustomRollbarNotifierMiddleware
+        )
+
+        extra = middleware.get_extra_data(request, Exception())
+        self.assertEqual(extra["trace_id"], request.timing.trace_id)
+        self.assertEqual(extra["timing"]["queries"], 3)
+
+
+# ================= ROLLBAR QUEUE =================
+
+
+class FakeRollbarHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self.server.received.append(json.loads(self.rfile.read(length)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"err": 0}')
+
+    def log_message(self, *args):
+        pass
+
+
+class RollbarQueueTest(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeRollbarHandler)
+        self.server.received = []
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        host, port = self.server.server_address
+        self.endpoint = f"http://{host}:{port}/api/1/"
+
+    def make_queue(self, **kwargs):
+        queue = RollbarQueue(self.endpoint, "token", **kwargs)
+        self.addCleanup(queue.stop)
+        return queue
+
+    def test_delivers_in_background(self):
+        queue = self.make_queue(batch_size=2)
+        queue.start()
+        for index in range(5):
+            queue.handle_payload({"data": {"index": index}})
+
+        self.assertTrue(queue.flush(timeout=5))
+        received = sorted(
+            item["data"]["index"] for item in self.server.received
+        )
+        self.assertEqual(received, [0, 1, 2, 3, 4])
+        self.assertEqual(queue.stats()["sent"], 5)
+
+    def test_payload_handler_suppresses_direct_send(self):
+        queue = self.make_queue()
+        self.assertIs(queue.handle_payload({"data": {}}), False)
+        self.assertEqual(queue.stats()["queued"], 1)
+
+    def test_overflow_drops_oldest(self):
+        queue = self.make_queue(maxsize=3)
+        for index in range(5):
+            queue.put(json.dumps({"index": index}))
+        queue.start()
+
+        self.assertTrue(queue.flush(timeout=5))
+        received = [item["index"] for item in self.server.received]
+        self.assertEqual(received, [2, 3, 4])
+        self.assertEqual(queue.stats()["dropped"], 2)
+
+    def test_stop_flushes_pending_items(self):
+        queue = self.make_queue()
+        queue.start()
+        queue.put(json.dumps({"index": 1}))
+        queue.stop()
+        self.assertEqual(len(self.server.received), 1)
+
+    def test_failed_delivery_is_counted(self):
+        queue = RollbarQueue("http://127.0.0.1:1/api/1/", "token", timeout=1)
+        self.addCleanup(queue.stop)
+        queue.start()
+        queue.put("{}")
+        self.assertTrue(queue.flush(timeout=5))
+        self.assertEqual(queue.stats()["failed"], 1)
+
+    def test_install_needs_access_token(self):
+        with (
+            patch.dict(rollbar.SETTINGS, {"access_token": None}),
+            patch("threading.Thread.start") as start,
+        ):
+            self.assertIsNone(rollbar_queue.install())
+        start.assert_not_called()
+
+
+# ================= BENCHMARKS =================
+
+
+class BenchmarkTest(TestCase):
+    def test_seed_distribution(self):
+        out = StringIO()
+        call_command(
+            "seed_benchmark_data",
+            "--tasks",
+            "200",
+            "--users",
+            "10",
+            "--labels",
+            "5",
+            stdout=out,
+        )
+
+        self.assertIn("Created 200 tasks", out.getvalue())
+        self.assertEqual(Task.objects.count(), 200)
+        top = Task.objects.filter(executor__username="bench_user_0").count()
+        last = Task.objects.filter(executor__username="bench_user_9").count()
+        self.assertGreater(top, last)
+
+    def test_benchmark_report(self):
+        call_command(
+            "seed_benchmark_data",
+            "--tasks",
+            "50",
+            "--users",
+            "5",
+            "--labels",
+            "3",
+            stdout=StringIO(),
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "report.json")
+            options = ["--iterations", "2", "--warmup", "0"]
+            call_command(
+                "run_benchmarks", *options, "--output", path, stdout=StringIO()
+            )
+            with open(path, encoding="utf-8") as source:
+                report = json.load(source)
+
+            out = StringIO()
+            call_command(
+                "run_benchmarks",
+                *options,
+                "--only",
+                "task_detail",
+                "--output",
+                os.path.join(tmp, "second.json"),
+                "--compare",
+                path,
+                stdout=out,
+            )
+
+        self.assertIn("task_detail p50_ms:", out.getvalue())
+        scenarios = report["scenarios"]
+        self.assertEqual(len(scenarios), 2 ** len(FILTER_NAMES) + 3)
+        for name in ("tasks_list[all]", "task_detail", "task_create"):
+            self.assertGreater(scenarios[name]["queries"], 0)
+            self.assertLessEqual(
+                scenarios[name]["p50_ms"], scenarios[name]["p95_ms"]
+            )
+        self.assertEqual(report["meta"]["tasks"], 50)
+        self.assertFalse(Task.objects.filter(name="Benchmark created task"))
+
+
+# ================= LABEL PREFETCH =================
+
+
+class TaskLabelsQueryCountTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="author")
+        cls.status = Status.objects.create(name="New")
+        cls.labels = [
+            Label.objects.create(name=name) for name in ("bug", "ui", "api")
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_tasks(self, count):
+        for index in range(count):
+            task = Task.objects.create(
+                name=f"Task {index}",
+                status=self.status,
+                author=self.user,
+            )
+            task.labels.set(self.labels[: index % 3 + 1])
+
+    def count_queries(self, url):
+        # Первый запрос прогревает кэш справочников фильтра
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, captured.captured_queries
+
+    def label_queries(self, queries):
+        return [query for query in queries if "tasks_tasklabel" in query["sql"]]
+
+    def test_list_labels_batched(self):
+        self.create_tasks(2)
+        _, few = self.count_queries(reverse("tasks_list"))
+        self.create_tasks(10)
+        response, many = self.count_queries(reverse("tasks_list"))
+
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(len(self.label_queries(many)), 1)
+        self.assertContains(
+            response, '<span class="badge bg-secondary me-1">api'
+        )
+
+    def test_detail_labels_single_query(self):
+        self.create_tasks(3)
+        task = Task.objects.get(name="Task 2")
+        response, queries = self.count_queries(
+            reverse("task_detail", kwargs={"pk": task.pk})
+        )
+
+        self.assertEqual(len(self.label_queries(queries)), 1)
+        self.assertEqual(
+            [label.name for label in response.context["task"].label_list],
+            ["api", "bug", "ui"],
+        )
+
+
+# ================= ROW CACHE =================
+
+
+class TaskRowCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="author")
+        cls.status = Status.objects.create(name="New")
+        cls.task = Task.objects.create(
+            name="Cached task", status=cls.status, author=cls.user
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_unchanged_row_served_from_cache(self):
+        self.client.get(reverse("tasks_list"))
+        # update() не трогает updated_at — строка остается в кэше
+        Task.objects.filter(pk=self.task.pk).update(name="Stale name")
+
+        response = self.client.get(reverse("tasks_list"))
+        self.assertContains(response, "Cached task")
+        self.assertNotContains(response, "Stale name")
+
+    def test_update_view_invalidates_row(self):
+        self.client.get(reverse("tasks_list"))
+        self.client.post(
+            reverse("task_update", kwargs={"pk": self.task.pk}),
+            {"name": "Renamed task", "status": self.status.pk},
+        )
+
+        response = self.client.get(reverse("tasks_list"))
+        self.assertContains(response, "Renamed task")
+        self.assertNotContains(response, "Cached task")
+
+    def test_status_rename_invalidates_row(self):
+        self.client.get(reverse("tasks_list"))
+        self.status.name = "Renamed status"
+        self.status.save()
+
+        response = self.client.get(reverse("tasks_list"))
+        self.assertContains(response, "Renamed status")
+
+    def test_key_depends_on_language(self):
+        task = task_queryset().get(pk=self.task.pk)
+        with translation.override("ru"):
+            russian = task_row_key(task)
+        with translation.override("en"):
+            english = task_row_key(task)
+        self.assertNotEqual(russian, english)
+
+
+# ================= CONDITIONAL GET =================
+
+
+@override_settings(SHARED_CACHE=True)
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="author")
+        cls.other = User.objects.create_user(username="other")
+        cls.status = Status.objects.create(name="New")
+        cls.task = Task.objects.create(
+            name="Task", status=cls.status, author=cls.user
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, headers={"if-none-match": etag})
+
+    def test_view_without_validators_is_unconditional(self):
+        class Page(View):
+            def get(self, request):
+                return HttpResponse("page")
+
+        class PlainView(ConditionalGetMixin, Page):
+            pass
+
+        request = RequestFactory().get("/", headers={"if-none-match": "*"})
+        request.user = self.user
+        response = PlainView.as_view()(request)
+        self.assertEqual(response.content, b"page")
+        self.assertFalse(response.has_header("ETag"))
+
+    @override_settings(SHARED_CACHE=False)
+    def test_no_validators_without_shared_cache(self):
+        # Переименование статуса в другом воркере не сменило бы ETag
+        for url in (
+            reverse("tasks_list"),
+            reverse("task_detail", args=[self.task.pk]),
+            reverse("tasks_list_async"),
+            reverse("task_detail_async", args=[self.task.pk]),
+        ):
+            with self.subTest(url):
+                response = self.revalidate(url, "*")
+                self.assertEqual(response.status_code, 200)
+                self.assertFalse(response.has_header("ETag"))
+
+    def test_unchanged_list_returns_304(self):
+        url = reverse("tasks_list")
+        response = self.client.get(url, {"status": self.status.pk})
+        etag = response["ETag"]
+        self.assertIn("private", response["Cache-Control"])
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(
+                url,
+                {"status": self.status.pk},
+                headers={"if-none-match": etag},
+            )
+        self.assertEqual(response.status_code, 304)
+        # Страница не собиралась: строки задач не читались
+        self.assertFalse(
+            [
+                query
+                for query in captured.captured_queries
+                if '"tasks_task"."name"' in query["sql"]
+            ]
+        )
+
+    def test_list_changes_invalidate_etag(self):
+        url = reverse("tasks_list")
+        etag = self.client.get(url)["ETag"]
+
+        Task.objects.create(
+            name="New task", status=self.status, author=self.user
+        )
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+        etag = self.client.get(url)["ETag"]
+        self.status.name = "Renamed"
+        self.status.save()
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_etag_depends_on_user(self):
+        url = reverse("tasks_list")
+        etag = self.client.get(url)["ETag"]
+        self.client.force_login(self.other)
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_detail_conditional(self):
+        url = reverse("task_detail", kwargs={"pk": self.task.pk})
+        response = self.client.get(url)
+        self.assertTrue(response.has_header("Last-Modified"))
+        etag = response["ETag"]
+        self.assertEqual(self.revalidate(url, etag).status_code, 304)
+
+        self.task.name = "Renamed"
+        self.task.save()
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_missing_task_is_not_conditional(self):
+        url = reverse("task_detail", kwargs={"pk": 0})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_pending_messages_skip_304(self):
+        url = reverse("tasks_list")
+        self.client.force_login(self.other)
+        etag = self.client.get(url)["ETag"]
+
+        # Чужую задачу удалить нельзя: список тот же, но есть сообщение
+        self.client.post(reverse("task_delete", kwargs={"pk": self.task.pk}))
+        response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Задачу может удалить только ее автор")
+        self.assertEqual(self.revalidate(url, etag).status_code, 304)
+
+
+# ================= TASK COUNTERS =================
+
+
+class TaskCountersTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username="author")
+        cls.executor = User.objects.create_user(username="executor")
+        cls.new = Status.objects.create(name="New")
+        cls.done = Status.objects.create(name="Done", is_closed=True)
+        cls.bug = Label.objects.create(name="bug")
+        cls.ui = Label.objects.create(name="ui")
+
+    def create_task(self, status=None, labels=()):
+        task = Task.objects.create(
+            name="Task",
+            status=status or self.new,
+            author=self.author,
+            executor=self.executor,
+        )
+        task.labels.set(labels)
+        return task
+
+    def counters(self):
+        def values(queryset, *fields):
+            return {row[0]: row[1:] for row in queryset.values_list(*fields)}
+
+        return (
+            values(Status.objects.all(), "name", "tasks_count"),
+            values(
+                Label.objects.all(), "name", "tasks_count", "open_tasks_count"
+            ),
+            values(
+                Profile.objects.all(),
+                "user__username",
+                "authored_tasks_count",
+                "assigned_tasks_count",
+                "open_assigned_tasks_count",
+            ),
+        )
+
+    def assertCountersMatchRecount(self):
+        current = self.counters()
+        call_command("recount_task_counters", stdout=StringIO())
+        self.assertEqual(current, self.counters())
+
+    def test_create_and_label(self):
+        self.create_task(labels=[self.bug, self.ui])
+
+        statuses, labels, profiles = self.counters()
+        self.assertEqual(statuses, {"New": (1,), "Done": (0,)})
+        self.assertEqual(labels, {"bug": (1, 1), "ui": (1, 1)})
+        self.assertEqual(profiles["author"], (1, 0, 0))
+        self.assertEqual(profiles["executor"], (0, 1, 1))
+        self.assertCountersMatchRecount()
+
+    def test_closing_task_updates_open_counters(self):
+        task = self.create_task(labels=[self.bug])
+        task.status = self.done
+        task.save()
+
+        statuses, labels, profiles = self.counters()
+        self.assertEqual(statuses, {"New": (0,), "Done": (1,)})
+        self.assertEqual(labels["bug"], (1, 0))
+        self.assertEqual(profiles["executor"], (0, 1, 0))
+        self.assertCountersMatchRecount()
+
+    def test_label_link_changes(self):
+        task = self.create_task(labels=[self.bug, self.ui])
+        task.labels.remove(self.bug, self.bug)
+        self.assertEqual(self.counters()[1]["bug"], (0, 0))
+
+        self.ui.tasks.clear()
+        TaskLabel.objects.create(task=task, label=self.bug)
+        self.assertEqual(self.counters()[1], {"bug": (1, 1), "ui": (0, 0)})
+        self.assertCountersMatchRecount()
+
+    def test_delete_task(self):
+        self.create_task(labels=[self.bug])
+        Task.objects.all().delete()
+
+        statuses, labels, profiles = self.counters()
+        self.assertEqual(statuses["New"], (0,))
+        self.assertEqual(labels["bug"], (0, 0))
+        self.assertEqual(profiles["executor"], (0, 0, 0))
+
+    def test_closing_status_recounts_open(self):
+        self.create_task(labels=[self.bug])
+        self.new.is_closed = True
+        self.new.save()
+
+        _, labels, profiles = self.counters()
+        self.assertEqual(labels["bug"], (1, 0))
+        self.assertEqual(profiles["executor"], (0, 1, 0))
+
+    def test_recount_repairs_drift(self):
+        self.create_task(labels=[self.bug])
+        Label.objects.update(tasks_count=10)
+        Profile.objects.all().delete()
+
+        out = StringIO()
+        call_command("recount_task_counters", stdout=out)
+        self.assertIn("labels: 2 fixed", out.getvalue())
+        self.assertEqual(self.counters()[1]["bug"], (1, 1))
+        self.assertEqual(self.counters()[2]["executor"], (0, 1, 1))
+
+    def test_import_updates_counters(self):
+        importer = TaskImporter()
+        importer.import_chunk(
+            [
+                {
+                    "name": "Imported",
+                    "status": "Done",
+                    "author": "author",
+                    "executor": "executor",
+                    "labels": "bug;ui",
+                }
+            ],
+            first_number=1,
+        )
+        self.assertEqual(self.counters()[1], {"bug": (1, 0), "ui": (1, 0)})
+        self.assertCountersMatchRecount()
+
+
+# ================= DELETE IMPACT =================
+
+
+class DeleteImpactTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="author")
+        cls.status = Status.objects.create(name="New")
+        cls.label = Label.objects.create(name="bug")
+        for index in range(3):
+            task = Task.objects.create(
+                name=f"Task {index}",
+                status=cls.status,
+                author=cls.user,
+                executor=cls.user,
+            )
+            task.labels.add(cls.label)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_mixin_without_impact_deletes(self):
+        class PlainDeleteView(DeleteImpactMixin, DeleteView):
+            model = Status
+            success_url = "/"
+
+        status = Status.objects.create(name="Unused")
+        request = RequestFactory().post("/")
+        request.user = self.user
+        response = PlainDeleteView.as_view()(request, pk=status.pk)
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Status.objects.filter(pk=status.pk).exists())
+
+    def test_capped_count(self):
+        self.assertEqual(str(capped_count(Task.objects.all(), cap=5)), "3")
+        usage = capped_count(Task.objects.all(), cap=2)
+        self.assertTrue(usage.capped)
+        self.assertEqual(str(usage), "2+")
+
+    def test_confirm_pages_show_usage(self):
+        for url in (
+            reverse("status_delete", kwargs={"pk": self.status.pk}),
+            reverse("label_delete", kwargs={"pk": self.label.pk}),
+            reverse("user_delete", kwargs={"pk": self.user.pk}),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, "Используется в задачах: 3")
+                self.assertNotContains(response, "Да, удалить")
+
+    def test_user_page_shows_unassigned_tasks(self):
+        other = User.objects.create_user(username="other")
+        Task.objects.update(executor=other)
+        self.client.force_login(other)
+
+        response = self.client.get(
+            reverse("user_delete", kwargs={"pk": other.pk})
+        )
+        self.assertContains(response, "исполнитель: 3")
+        self.assertContains(response, "Да, удалить")
+
+    def test_protected_delete_skips_collector(self):
+        url = reverse("label_delete", kwargs={"pk": self.label.pk})
+        with patch("django.db.models.deletion.Collector.collect") as collect:
+            response = self.client.post(url, follow=True)
+
+        collect.assert_not_called()
+        self.assertContains(response, "Невозможно удалить метку")
+        self.assertTrue(Label.objects.filter(pk=self.label.pk).exists())
+
+    def test_used_objects_are_not_deleted(self):
+        for model, url in (
+            (Status, reverse("status_delete", kwargs={"pk": self.status.pk})),
+            (Label, reverse("label_delete", kwargs={"pk": self.label.pk})),
+            (User, reverse("user_delete", kwargs={"pk": self.user.pk})),
+        ):
+            with self.subTest(url=url):
+                response = self.client.post(url, follow=True)
+                self.assertContains(response, "используется")
+                self.assertEqual(model.objects.count(), 1)
+
+    def test_unused_status_is_deleted(self):
+        status = Status.objects.create(name="Unused")
+        response = self.client.post(
+            reverse("status_delete", kwargs={"pk": status.pk})
+        )
+        self.assertRedirects(response, reverse("statuses_list"))
+        self.assertFalse(Status.objects.filter(pk=status.pk).exists())
+
+
+# ================= AUTOCOMPLETE =================
+
+
+class AutocompleteTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="ivanov", first_name="Иван", last_name="Петров"
+        )
+        for index in range(30):
+            User.objects.create_user(username=f"user{index:02}")
+        cls.status = Status.objects.create(name="New")
+        cls.bug = Label.objects.create(name="Bug")
+        Label.objects.create(name="backend")
+        Label.objects.create(name="ui")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def results(self, name, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, 200)
+        return [item["text"] for item in response.json()["results"]]
+
+    def test_executor_prefix_search(self):
+        self.assertEqual(
+            self.results("autocomplete_executors", q="IVA"), ["Иван Петров"]
+        )
+        self.assertEqual(
+            # SQLite сравнивает без учета регистра только ASCII
+            self.results("autocomplete_executors", q="Петров Ив"),
+            ["Иван Петров"],
+        )
+        self.assertEqual(self.results("autocomplete_executors", q="van"), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.results("autocomplete_executors")), 20)
+        self.assertEqual(
+            len(self.results("autocomplete_executors", q="user", limit=500)),
+            30,
+        )
+        self.assertEqual(
+            len(self.results("autocomplete_executors", limit=5)), 5
+        )
+
+    def test_label_prefix_search(self):
+        self.assertEqual(
+            self.results("autocomplete_labels", q="b"), ["backend", "Bug"]
+        )
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse("autocomplete_labels"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_form_renders_only_selected_options(self):
+        task = Task.objects.create(
+            name="Task",
+            status=self.status,
+            author=self.user,
+            executor=self.user,
+        )
+        task.labels.add(self.bug)
+
+        response = self.client.get(
+            reverse("task_update", kwargs={"pk": task.pk})
+        )
+        self.assertContains(response, 'data-autocomplete-url="/tasks/')
+        self.assertContains(response, "Иван Петров")
+        self.assertContains(response, ">Bug</option>")
+        self.assertNotContains(response, "user01")
+        self.assertNotContains(response, "backend")
+        self.assertContains(response, "task_manager/autocomplete.js")
+
+    def test_form_validates_submitted_ids(self):
+        other = User.objects.get(username="user05")
+        form = TaskForm(
+            data={
+                "name": "Task",
+                "status": self.status.pk,
+                "executor": other.pk,
+                "labels": [self.bug.pk],
+            }
+        )
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["executor"], other)
+
+        form = TaskForm(
+            data={"name": "Task", "status": self.status.pk, "labels": [0]}
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("labels", form.errors)
+
+    def test_prefix_search_uses_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite plan")
+        queryset = Label.objects.filter(name__istartswith="b").values("pk")
+        self.assertIn("label_name_prefix_idx", queryset.explain())
+
+
+# ================= USERS LIST =================
+
+
+class UsersListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f"user{index:02}")
+            for index in range(55)
+        ]
+        cls.worker = User.objects.create_user(
+            username="worker", first_name="Анна", last_name="Смирнова"
+        )
+        status = Status.objects.create(name="New")
+        for executor in (cls.worker, cls.worker, None):
+            Task.objects.create(
+                name="Task", status=status, author=cls.worker, executor=executor
+            )
+        Task.objects.create(
+            name="Task", status=status, author=cls.users[0], executor=cls.worker
+        )
+
+    def test_paginated_with_single_query(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse("users_list"))
+        self.assertEqual(len(response.context["users"]), 50)
+        self.assertTrue(response.context["page_obj"].has_next())
+        user_queries = [
+            query
+            for query in captured.captured_queries
+            if 'FROM "auth_user"' in query["sql"]
+        ]
+        self.assertEqual(len(user_queries), 1)
+
+        response = self.client.get(
+            f"{reverse('users_list')}?{response.context['page_obj'].next_querystring}"
+        )
+        self.assertEqual(len(response.context["users"]), 6)
+
+    def test_search_and_counts(self):
+        self.client.force_login(self.worker)
+        response = self.client.get(reverse("users_list"), {"q": "Смирнова"})
+        (worker,) = response.context["users"]
+        self.assertEqual(
+            (
+                worker.authored_count,
+                worker.assigned_count,
+                worker.open_assigned_count,
+            ),
+            (3, 3, 3),
+        )
+        self.assertContains(response, "Открытые задачи")
+
+        response = self.client.get(reverse("users_list"), {"q": "user0"})
+        self.assertEqual(len(response.context["users"]), 10)
+        self.assertEqual(response.context["users"][0].authored_count, 1)
+
+    def test_counts_hidden_from_anonymous(self):
+        response = self.client.get(reverse("users_list"), {"q": "worker"})
+        self.assertFalse(response.context["show_counts"])
+        self.assertNotContains(response, "Открытые задачи")
+        self.assertFalse(
+            hasattr(response.context["users"][0], "authored_count")
+        )
+
+    def test_tampered_cursor_shows_first_page(self):
+        for values in ([None], [{}], ["user01", "extra"]):
+            with self.subTest(values=values):
+                response = self.client.get(
+                    reverse("users_list"),
+                    {"cursor": encode_cursor(NEXT, values)},
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    response.context["users"][0].username, "user00"
+                )
+
+    def test_counts_use_indexes(self):
+        queryset = with_task_counts(User.objects.all()).order_by("username")
+        self.assertEqual(sequential_scans(explain(queryset[:50])), [])
+
+
+# ================= DATABASE CONNECTIONS =================
+
+
+class DatabaseSettingsTest(SimpleTestCase):
+    url = "postgres://user:secret@db:5432/tasks"
+
+    def test_sqlite_without_url(self):
+        config = database_settings(None, {}, "db.sqlite3")
+        self.assertEqual(config["ENGINE"], "django.db.backends.sqlite3")
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+        self.assertTrue(config["CONN_HEALTH_CHECKS"])
+
+    def test_persistent_connections(self):
+        config = database_settings(self.url, {}, "db.sqlite3")
+        self.assertEqual(config["CONN_MAX_AGE"], 600)
+        self.assertTrue(config["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("pool", config.get("OPTIONS", {}))
+
+        config = database_settings(
+            self.url, {"DB_CONN_MAX_AGE": "60"}, "db.sqlite3"
+        )
+        self.assertEqual(config["CONN_MAX_AGE"], 60)
+
+    def test_asgi_closes_connections(self):
+        env = {"DJANGO_ASGI": "True", "DB_CONN_MAX_AGE": "60"}
+        self.assertEqual(
+            database_settings(self.url, env, "")["CONN_MAX_AGE"], 0
+        )
+        self.assertEqual(database_settings(None, env, "")["CONN_MAX_AGE"], 0)
+
+        env["DB_POOL"] = "True"
+        with patch("importlib.util.find_spec", return_value=object()):
+            config = database_settings(self.url, env, "")
+        self.assertIn("pool", config["OPTIONS"])
+
+    def test_pool(self):
+        env = {"DB_POOL": "True", "DB_POOL_MAX_SIZE": "4"}
+        with patch("importlib.util.find_spec", return_value=object()):
+            config = database_settings(self.url, env, "db.sqlite3")
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+        self.assertEqual(
+            config["OPTIONS"]["pool"],
+            {"min_size": 2, "max_size": 4, "timeout": 10},
+        )
+
+    def test_pool_errors(self):
+        env = {"DB_POOL": "True"}
+        with self.assertRaises(ImproperlyConfigured):
+            database_settings("sqlite:///tasks.db", env, "db.sqlite3")
+        with (
+            patch("importlib.util.find_spec", return_value=None),
+            self.assertRaises(ImproperlyConfigured),
+        ):
+            database_settings(self.url, env, "db.sqlite3")
+        with self.assertRaises(ImproperlyConfigured):
+            database_settings(self.url, {"DB_CONN_MAX_AGE": "x"}, "")
+
+
+class ConnectionBenchmarkTest(TestCase):
+    def test_command_writes_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "connections.json")
+            out = StringIO()
+            call_command(
+                "benchmark_db_connections",
+                "--requests",
+                "5",
+                "--output",
+                path,
+                stdout=out,
+            )
+            with open(path, encoding="utf-8") as source:
+                report = json.load(source)
+        self.assertEqual(set(report["modes"]), {"new_connection", "persistent"})
+        self.assertEqual(report["modes"]["persistent"]["requests"], 5)
+        self.assertIn("pool: skipped", out.getvalue())
+
+
+# ================= ASYNC VIEWS =================
+
+
+@override_settings(SHARED_CACHE=True)
+class AsyncTaskViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="author")
+        cls.status = Status.objects.create(name="New")
+        cls.other_status = Status.objects.create(name="Done")
+        label = Label.objects.create(name="bug")
+        cls.tasks = [
+            Task.objects.create(
+                name=f"Task {number}",
+                status=cls.status if number % 2 else cls.other_status,
+                author=cls.user,
+            )
+            for number in range(60)
+        ]
+        cls.tasks[-1].labels.add(label)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def task_ids(self, response):
+        return [task.pk for task in response.context["tasks"]]
+
+    def test_list_matches_sync_view(self):
+        params = {"status": self.status.pk}
+        sync_response = self.client.get(reverse("tasks_list"), params)
+        response = self.client.get(reverse("tasks_list_async"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.task_ids(response), self.task_ids(sync_response))
+        self.assertContains(response, "bug")
+        self.assertContains(response, f'value="{self.status.pk}" selected')
+
+        page_obj = response.context["page_obj"]
+        self.assertFalse(page_obj.has_next())
+        response = self.client.get(reverse("tasks_list_async"))
+        self.assertEqual(len(response.context["tasks"]), 50)
+        self.assertTrue(response.context["page_obj"].has_next())
+
+    def test_list_conditional_get(self):
+        url = reverse("tasks_list_async")
+        etag = self.client.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(
+            [
+                query
+                for query in captured.captured_queries
+                if '"tasks_task"."name"' in query["sql"]
+            ]
+        )
+
+        self.tasks[0].name = "Renamed"
+        self.tasks[0].save()
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_filter_shows_no_tasks(self):
+        response = self.client.get(reverse("tasks_list_async"), {"status": 0})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.task_ids(response), [])
+        self.assertNotIn("ETag", response)
+
+    def test_detail(self):
+        task = self.tasks[-1]
+        url = reverse("task_detail_async", kwargs={"pk": task.pk})
+        response = self.client.get(url)
+        self.assertContains(response, task.name)
+        self.assertContains(response, "bug")
+
+        response = self.client.get(
+            url, headers={"if-none-match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        missing = reverse("task_detail_async", kwargs={"pk": 0})
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse("tasks_list_async"))
+        self.assertRedirects(
+            response,
+            f"{reverse('login')}?next={reverse('tasks_list_async')}",
+            fetch_redirect_response=False,
+        )
+
+    async def test_timing_under_async_stack(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("tasks_list_async"))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('desc="0 queries"', response["Server-Timing"])
+
+
+class ConcurrencyBenchmarkTest(TransactionTestCase):
+    def test_sync_and_async_pages(self):
+        user = User.objects.create_user(username="bench")
+        status = Status.objects.create(name="New")
+        Task.objects.create(name="Task", status=status, author=user)
+
+        result = concurrency.run(user, clients=2, requests=2)
+        self.assertEqual(set(result["pages"]), {"tasks_list", "task_detail"})
+        for modes in result["pages"].values():
+            self.assertEqual(modes["sync"]["requests"], 4)
+            self.assertEqual(modes["async"]["requests"], 4)
+
+
+# ================= AUTH CACHE =================
+
+
+CACHED_AUTH = {
+    "SESSION_ENGINE": "django.contrib.sessions.backends.cached_db",
+    "AUTHENTICATION_BACKENDS": [
+        "task_manager.users.backends.CachedModelBackend",
+        "django.contrib.auth.backends.ModelBackend",
+    ],
+}
+
+
+class LocalCacheAuthenticationTest(TestCase):
+    def test_sessions_and_users_are_read_from_db(self):
+        # В тестах нет REDIS_URL: кеш у процесса свой
+        self.assertEqual(
+            settings.SESSION_ENGINE, "django.contrib.sessions.backends.db"
+        )
+        self.assertEqual(
+            settings.AUTHENTICATION_BACKENDS,
+            ["django.contrib.auth.backends.ModelBackend"],
+        )
+
+
+@override_settings(**CACHED_AUTH)
+class CachedAuthenticationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="user", password="pass", first_name="John"
+        )
+
+    def setUp(self):
+        self.client.login(username="user", password="pass")
+
+    def auth_queries(self, url):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [
+            query["sql"]
+            for query in captured.captured_queries
+            if "django_session" in query["sql"] or '"auth_user"' in query["sql"]
+        ]
+
+    def test_steady_state_needs_no_session_or_user_queries(self):
+        self.auth_queries(reverse("statuses_list"))
+        self.assertEqual(self.auth_queries(reverse("statuses_list")), [])
+
+    def test_profile_update_refreshes_user(self):
+        self.client.get(reverse("statuses_list"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("user_update", kwargs={"pk": self.user.pk}),
+                {"first_name": "Jack", "last_name": "", "username": "user"},
+            )
+        response = self.client.get(reverse("statuses_list"))
+        self.assertEqual(response.wsgi_request.user.first_name, "Jack")
+
+    def test_password_change_logs_other_sessions_out(self):
+        self.client.get(reverse("statuses_list"))
+        self.user.set_password("new-pass")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        response = self.client.get(reverse("statuses_list"))
+        self.assertRedirects(
+            response,
+            f"{reverse('login')}?next={reverse('statuses_list')}",
+            fetch_redirect_response=False,
+        )
+
+    def test_sessions_of_model_backend_stay_valid(self):
+        self.client.force_login(
+            self.user, backend="django.contrib.auth.backends.ModelBackend"
+        )
+        response = self.client.get(reverse("statuses_list"))
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_deleted_user_is_anonymous(self):
+        self.client.get(reverse("statuses_list"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("user_delete", kwargs={"pk": self.user.pk})
+            )
+        response = self.client.get(reverse("index"))
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+
+# ================= DASHBOARD =================
+
+
+class DashboardTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="author", first_name="Анна", last_name="Смирнова"
+        )
+        cls.status = Status.objects.create(name="New")
+
+    def create_task(self):
+        return Task.objects.create(
+            name="Task",
+            status=self.status,
+            author=self.user,
+            executor=self.user,
+        )
+
+    def daily(self):
+        return dict(TaskDailyCount.objects.values_list("day", "created_count"))
+
+    def test_daily_counts_follow_writes(self):
+        today = timezone.localdate()
+        task = self.create_task()
+        self.create_task()
+        task.delete()
+        TaskImporter().import_chunk(
+            [{"name": "Imported", "status": "New", "author": "author"}], 1
+        )
+        self.assertEqual(self.daily(), {today: 2})
+
+    def test_recount_repairs_days(self):
+        today = timezone.localdate()
+        yesterday = today - datetime.timedelta(days=1)
+        task = self.create_task()
+        self.create_task()
+        # update() идет мимо сигналов
+        Task.objects.filter(pk=task.pk).update(
+            created_at=timezone.now() - datetime.timedelta(days=1)
+        )
+
+        out = StringIO()
+        call_command("recount_task_counters", stdout=out)
+        self.assertIn("days: 2 fixed", out.getvalue())
+        self.assertEqual(self.daily(), {today: 1, yesterday: 1})
+
+    def test_index_reads_only_summaries(self):
+        self.create_task()
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse("index"))
+        dashboard = response.context["dashboard"]
+        self.assertEqual(dashboard["total"], 1)
+        self.assertEqual(dashboard["days"][-1]["count"], 1)
+        self.assertEqual(dashboard["days"][-1]["share"], 100)
+        self.assertContains(response, "Анна Смирнова")
+        self.assertFalse(
+            [
+                query
+                for query in captured.captured_queries
+                if '"tasks_task"' in query["sql"]
+            ]
+        )
+
+    def test_anonymous_index_has_no_dashboard(self):
+        response = self.client.get(reverse("index"))
+        self.assertNotIn("dashboard", response.context)
+
+
+# ================= LABEL SYNC =================
+
+
+class LabelSyncTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="author")
+        cls.status = Status.objects.create(name="New")
+        cls.bug, cls.ui, cls.api = (
+            Label.objects.create(name=name) for name in ("bug", "ui", "api")
+        )
+        cls.task = Task.objects.create(
+            name="Task", status=cls.status, author=cls.user
+        )
+        cls.task.labels.set([cls.bug, cls.ui])
+
+    def label_counts(self):
+        return dict(Label.objects.values_list("name", "tasks_count"))
+
+    def test_writes_only_the_difference(self):
+        kept = TaskLabel.objects.get(task=self.task, label=self.bug)
+        with CaptureQueriesContext(connection) as captured:
+            added, removed = sync_labels(self.task, [self.bug, self.api])
+        self.assertEqual((added, removed), ({self.api.pk}, {self.ui.pk}))
+
+        statements = [
+            query["sql"].split()[0]
+            for query in captured.captured_queries
+            if "SAVEPOINT" not in query["sql"]
+        ]
+        # SELECT связей, INSERT, DELETE и по UPDATE на рост и убыль меток
+        self.assertEqual(
+            statements, ["SELECT", "INSERT", "DELETE", "UPDATE", "UPDATE"]
+        )
+        self.assertEqual(
+            TaskLabel.objects.get(pk=kept.pk).created_at, kept.created_at
+        )
+        self.assertEqual(self.label_counts(), {"bug": 1, "ui": 0, "api": 1})
+
+    def test_update_view_keeps_statement_count(self):
+        self.client.force_login(self.user)
+        url = reverse("task_update", kwargs={"pk": self.task.pk})
+        data = {"name": "Task", "status": self.status.pk}
+
+        def link_statements(labels):
+            with CaptureQueriesContext(connection) as captured:
+                self.client.post(url, {**data, "labels": labels})
+            return [
+                query["sql"]
+                for query in captured.captured_queries
+                # Начальные значения формы читают метки через JOIN
+                if 'FROM "tasks_tasklabel"' in query["sql"]
+                or 'INTO "tasks_tasklabel"' in query["sql"]
+            ]
+
+        self.assertEqual(len(link_statements([self.bug.pk])), 2)
+        self.assertEqual(
+            len(link_statements([self.ui.pk, self.api.pk, self.bug.pk])), 2
+        )
+        self.assertEqual(
+            set(self.task.labels.values_list("name", flat=True)),
+            {"bug", "ui", "api"},
+        )
+        self.assertEqual(self.label_counts(), {"bug": 1, "ui": 1, "api": 1})
+
+
+# ================= BULK ACTIONS =================
+
+
+class BulkActionsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username="author")
+        cls.other = User.objects.create_user(username="other")
+        cls.new = Status.objects.create(name="New")
+        cls.done = Status.objects.create(name="Done", is_closed=True)
+        cls.bug = Label.objects.create(name="bug")
+        cls.tasks = [
+            Task.objects.create(
+                name=f"Task {number}",
+                status=cls.new,
+                author=cls.author if number < 3 else cls.other,
+                executor=cls.other,
+            )
+            for number in range(4)
+        ]
+        cls.tasks[0].labels.set([cls.bug])
+        cls.ids = [task.pk for task in cls.tasks]
+
+    counters = TaskCountersTest.counters
+
+    def assertCountersMatchRecount(self):
+        current = self.counters(), self.days()
+        call_command("recount_task_counters", stdout=StringIO())
+        self.assertEqual(current, (self.counters(), self.days()))
+
+    def days(self):
+        return dict(TaskDailyCount.objects.values_list("day", "created_count"))
+
+    def test_actions_keep_counters(self):
+        actions = [
+            ("status", {"status": self.done}, 4),
+            ("status", {"status": self.done}, 0),
+            ("executor", {"executor": self.author}, 4),
+            ("executor", {"executor": None}, 4),
+            ("add_label", {"label": self.bug}, 3),
+            ("remove_label", {"label": self.bug}, 4),
+            ("status", {"status": self.new}, 4),
+        ]
+        for action, params, expected in actions:
+            with self.subTest(action=action, **params):
+                count = bulk.run(action, self.ids, self.author, **params)
+                self.assertEqual(count, expected)
+                self.assertCountersMatchRecount()
+
+        statuses, labels, profiles = self.counters()
+        self.assertEqual(statuses, {"New": (4,), "Done": (0,)})
+        self.assertEqual(labels["bug"], (0, 0))
+        self.assertEqual(profiles["other"], (1, 0, 0))
+
+    def test_updates_touch_updated_at(self):
+        Task.objects.update(
+            updated_at=timezone.now() - datetime.timedelta(days=1)
+        )
+        before = timezone.now()
+        bulk.run("add_label", self.ids[1:3], self.author, label=self.bug)
+
+        touched = Task.objects.filter(updated_at__gte=before)
+        self.assertEqual(
+            set(touched.values_list("pk", flat=True)), set(self.ids[1:3])
+        )
+
+    def test_fixed_statement_count(self):
+        def statements(task_ids):
+            with CaptureQueriesContext(connection) as captured:
+                bulk.run("status", task_ids, self.author, status=self.done)
+            bulk.run("status", task_ids, self.author, status=self.new)
+            return len(captured.captured_queries)
+
+        self.assertEqual(statements(self.ids[:1]), statements(self.ids))
+
+    def test_delete_only_own_tasks(self):
+        count = bulk.run("delete", self.ids, self.author)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(
+            list(Task.objects.values_list("pk", flat=True)), self.ids[3:]
+        )
+        self.assertCountersMatchRecount()
+        self.assertEqual(self.counters()[1]["bug"], (0, 0))
+
+    def test_view_reports_count(self):
+        self.client.force_login(self.author)
+        url = reverse("tasks_bulk")
+        next_url = reverse("tasks_list") + "?self_tasks=on"
+
+        response = self.client.post(
+            url,
+            {
+                "action": "delete",
+                "tasks": self.ids[2:],
+                "next": next_url,
+            },
+        )
+        self.assertRedirects(response, next_url, fetch_redirect_response=False)
+        response = self.client.get(next_url)
+        self.assertContains(response, "Удалено задач: 1")
+        self.assertContains(response, "пропущено: 1")
+
+        response = self.client.post(
+            url,
+            {"action": "status", "tasks": self.ids[:2]},
+            follow=True,
+        )
+        self.assertContains(response, "Выберите задачи и параметры действия")
+
+    def test_list_has_bulk_form(self):
+        self.client.force_login(self.author)
+        response = self.client.get(reverse("tasks_list"))
+        self.assertContains(response, 'id="bulk-form"')
+        self.assertContains(
+            response, f'name="tasks" value="{self.tasks[0].pk}"'
+        )
+
+
+# ================= FILTER PRESETS =================
+
+
+@override_settings(SHARED_CACHE=True)
+class FilterPresetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="author")
+        cls.new = Status.objects.create(name="New")
+        cls.done = Status.objects.create(name="Done", is_closed=True)
+        cls.bug = Label.objects.create(name="bug")
+        for number in range(3):
+            Task.objects.create(
+                name=f"Task {number}",
+                status=cls.new if number else cls.done,
+                author=cls.user,
+            )
+        cls.preset = FilterPreset.objects.create(
+            user=cls.user, name="Новые", query=f"status={cls.new.pk}"
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse("tasks_list")
+
+    def preset_queries(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.url)
+        self.assertEqual(response.context["presets"], [self.preset])
+        counts = [
+            query["sql"]
+            for query in captured.captured_queries
+            if "COUNT(" in query["sql"] and "MAX(" not in query["sql"]
+        ]
+        return response.context["presets"][0].count, len(counts)
+
+    def test_count_is_cached_until_tasks_change(self):
+        self.assertEqual(self.preset_queries(), (2, 1))
+        self.assertEqual(self.preset_queries(), (2, 0))
+
+        Task.objects.create(name="Task", status=self.new, author=self.user)
+        self.assertEqual(self.preset_queries(), (3, 1))
+
+        bulk.run(
+            "status", [Task.objects.last().pk], self.user, status=self.done
+        )
+        self.assertEqual(self.preset_queries(), (2, 1))
+
+    @override_settings(SHARED_CACHE=False)
+    def test_count_is_not_cached_locally(self):
+        self.assertEqual(self.preset_queries(), (2, 1))
+        self.assertEqual(self.preset_queries(), (2, 1))
+
+    def test_label_links_invalidate_counts(self):
+        self.preset.query = f"label={self.bug.pk}"
+        self.preset.save()
+        self.assertEqual(self.preset_queries()[0], 0)
+
+        Task.objects.first().labels.add(self.bug)
+        self.assertEqual(self.preset_queries()[0], 1)
+
+    def test_create_normalizes_query(self):
+        response = self.client.post(
+            reverse("filter_preset_create"),
+            {
+                "name": "Мои",
+                "query": f"self_tasks=on&q=&label=&status={self.new.pk}&x=1",
+            },
+        )
+        preset = FilterPreset.objects.get(name="Мои")
+        self.assertEqual(preset.query, f"self_tasks=on&status={self.new.pk}")
+        self.assertRedirects(
+            response,
+            f"{self.url}?{preset.query}",
+            fetch_redirect_response=False,
+        )
+
+        response = self.client.post(
+            reverse("filter_preset_create"), {"name": "Мои"}, follow=True
+        )
+        self.assertContains(response, "Фильтр с таким названием уже есть")
+        self.assertEqual(self.user.filter_presets.count(), 2)
+
+    def test_delete_only_own_preset(self):
+        other = User.objects.create_user(username="other")
+        self.client.force_login(other)
+        url = reverse("filter_preset_delete", kwargs={"pk": self.preset.pk})
+        self.assertEqual(self.client.post(url).status_code, 404)
+
+        self.client.force_login(self.user)
+        self.client.post(url)
+        self.assertFalse(FilterPreset.objects.exists())
+
+    def test_etag_follows_preset_counts(self):
+        etag = self.client.get(self.url)["ETag"]
+        filtered = f"{self.url}?status={self.done.pk}"
+        done_etag = self.client.get(filtered)["ETag"]
+
+        # Список закрытых задач не изменился, но счетчик пресета — да
+        Task.objects.create(name="Task", status=self.new, author=self.user)
+        response = self.client.get(filtered, HTTP_IF_NONE_MATCH=done_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(self.client.get(self.url)["ETag"], etag)
+
+    def test_async_list_shows_presets(self):
+        response = self.client.get(reverse("tasks_list_async"))
+        self.assertContains(response, "Новые")
+        self.assertEqual(response.context["presets"][0].count, 2)
+
+
+# ================= TASK EVENTS =================
+
+
+class TaskEventHubTest(SimpleTestCase):
+    async def test_publish_from_thread_reaches_subscriber(self):
+        hub = Hub()
+        subscriber, missed = hub.subscribe()
+        self.assertEqual(missed, [])
+
+        await asyncio.to_thread(hub.publish, "created", {"id": 1})
+        event = await asyncio.wait_for(subscriber.queue.get(), 1)
+        self.assertEqual((event.kind, event.task), ("created", {"id": 1}))
+
+        hub.unsubscribe(subscriber)
+        self.assertFalse(hub.subscribers)
+
+    async def test_resume_from_last_event_id(self):
+        hub = Hub(history=3)
+        first, *_ = [hub.publish("updated", {"id": pk}) for pk in range(3)]
+
+        _, missed = hub.subscribe(first.id)
+        self.assertEqual([event.task["id"] for event in missed], [1, 2])
+        self.assertEqual(hub.subscribe(hub.last_id)[1], [])
+        self.assertIsNone(hub.subscribe(f"other-{first.seq}")[1])
+
+        # История короче пропуска — клиенту нужно перезагрузить список
+        hub.publish("updated", {"id": 3})
+        hub.publish("updated", {"id": 4})
+        self.assertIsNone(hub.subscribe(first.id)[1])
+
+        last_id = hub.last_id
+        hub.skip()
+        self.assertIsNone(hub.subscribe(last_id)[1])
+
+    async def test_overflow_closes_subscriber(self):
+        hub = Hub(buffer=1)
+        subscriber, _ = hub.subscribe()
+        hub.publish("created", {"id": 1})
+        hub.publish("created", {"id": 2})
+        await asyncio.sleep(0)
+
+        self.assertFalse(subscriber.closed)
+        await subscriber.queue.get()
+        self.assertTrue(subscriber.closed)
+
+
+@override_settings(TASK_EVENTS_ENABLED=True)
+class TaskEventsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="author")
+        cls.new = Status.objects.create(name="New")
+        cls.done = Status.objects.create(name="Done", is_closed=True)
+        cls.bug = Label.objects.create(name="bug")
+
+    def create_task(self, name="Fix login page", status=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Task.objects.create(
+                name=name, status=status or self.new, author=self.user
+            )
+
+    def test_matcher_follows_task_filter(self):
+        matcher = TaskMatcher(
+            {"status": self.new, "self_tasks": True, "q": "fix LOG"},
+            self.user,
+        )
+        task = {
+            "id": 1,
+            "status_id": self.new.pk,
+            "author_id": self.user.pk,
+            "executor_id": None,
+            "label_ids": [],
+        }
+        words = ("fix", "login", "page")
+        created = TaskEvent(1, "b-1", "created", task, words)
+        self.assertIn("event: created", matcher.message(created))
+
+        moved = {**task, "status_id": self.done.pk}
+        self.assertIsNone(
+            matcher.message(TaskEvent(2, "b-2", "created", moved, words))
+        )
+        message = matcher.message(TaskEvent(3, "b-3", "updated", moved, words))
+        self.assertEqual(
+            message, 'id: b-3\nevent: removed\ndata: {"id": 1}\n\n'
+        )
+
+        label_matcher = TaskMatcher({"label": self.bug}, self.user)
+        self.assertFalse(label_matcher.matches(task))
+        self.assertTrue(
+            label_matcher.matches({**task, "label_ids": [self.bug.pk]})
+        )
+
+    def test_writes_publish_after_commit(self):
+        with patch("task_manager.tasks.events.publish_tasks") as publish:
+            task = self.create_task()
+            publish.assert_called_once_with("created", [task.pk])
+
+            with self.captureOnCommitCallbacks(execute=True):
+                task.labels.add(self.bug)
+                bulk.run("status", [task.pk], self.user, status=self.done)
+                bulk.run("delete", [task.pk], self.user)
+        self.assertEqual(
+            publish.call_args_list[1:],
+            [
+                (("updated", [task.pk]),),
+                (("updated", [task.pk]),),
+                (("deleted", [task.pk]),),
+            ],
+        )
+
+    def use_hub(self):
+        hub = Hub()
+        for target in (
+            patch.object(events, "hub", hub),
+            patch.object(TaskEventsView, "hub", hub),
+        ):
+            target.start()
+            self.addCleanup(target.stop)
+        return hub
+
+    async def test_stream_sends_matching_events(self):
+        hub = self.use_hub()
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse("task_events"), {"status": self.new.pk}
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b"retry: 3000\n\n")
+        self.assertEqual(len(hub.subscribers), 1)
+
+        # Поток подписан с первого чтения — теперь пишем задачи
+        await sync_to_async(self.create_task)("Closed", self.done)
+        task = await sync_to_async(self.create_task)()
+        message = (await asyncio.wait_for(anext(chunks), 5)).decode()
+        self.assertIn("event: created", message)
+        data = json.loads(message.split("data: ")[1])
+        self.assertEqual(
+            (data["id"], data["name"], data["status"]),
+            (task.pk, "Fix login page", "New"),
+        )
+
+    async def test_closed_stream_unsubscribes(self):
+        hub = self.use_hub()
+        stream = TaskEventsView().stream(TaskMatcher({}, self.user), None)
+        await anext(stream)
+        self.assertEqual(len(hub.subscribers), 1)
+        await stream.aclose()
+        self.assertFalse(hub.subscribers)
+
+    async def test_stream_resets_unknown_history(self):
+        self.use_hub()
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse("task_events"), headers={"Last-Event-ID": "gone-1"}
+        )
+        content = b"".join(
+            [chunk async for chunk in response.streaming_content]
+        )
+        self.assertIn(b"event: reset", content)
+
+    async def test_invalid_filter_is_rejected(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse("task_events"), {"status": 0}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_wsgi_request_gets_no_stream(self):
+        hub = self.use_hub()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("task_events"))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(hub.subscribers)
+
+    def test_list_page_starts_from_rendered_event(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("tasks_list"))
+        self.assertContains(response, f"last_event_id={events.hub.last_id}")
+
+    @override_settings(TASK_EVENTS_ENABLED=False)
+    async def test_disabled_events_are_off(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("task_events"))
+        self.assertEqual(response.status_code, 204)
+
+        response = await self.async_client.get(reverse("tasks_list"))
+        self.assertNotContains(response, "task-events-reset")
+        self.assertNotContains(response, reverse("task_events"))
+
+        with patch("task_manager.tasks.events.publish_tasks") as publish:
+            await sync_to_async(self.create_task)()
+        publish.assert_not_called()
+
+
+@override_settings(TASK_EVENTS_ENABLED=True)
+class TaskEventLabelsTest(TransactionTestCase):
+    # Без captureOnCommitCallbacks: в autocommit событие save() уходит
+    # сразу, раньше, чем форма запишет метки
+    def setUp(self):
+        self.user = User.objects.create_user(username="author")
+        self.status = Status.objects.create(name="New")
+        self.bug = Label.objects.create(name="bug")
+        self.ui = Label.objects.create(name="ui")
+        self.client.force_login(self.user)
+
+        self.hub = Hub()
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.hub.subscribers.add(events.Subscriber(loop, 10))
+        for target in (
+            patch.object(events, "hub", self.hub),
+            patch.object(TaskEventsView, "hub", self.hub),
+        ):
+            target.start()
+            self.addCleanup(target.stop)
+
+    def last_labels(self, task):
+        sent = [e.task for e in self.hub.history if e.task["id"] == task.pk]
+        return sent[-1]["labels"]
+
+    def test_form_events_carry_saved_labels(self):
+        data = {"name": "Fix login page", "status": self.status.pk}
+        self.client.post(
+            reverse("task_create"), {**data, "labels": [self.bug.pk]}
+        )
+        task = Task.objects.get()
+        self.assertEqual(self.last_labels(task), ["bug"])
+
+        self.client.post(
+            reverse("task_update", args=[task.pk]),
+            {**data, "labels": [self.ui.pk]},
+        )
+        self.assertEqual(self.last_labels(task), ["ui"])
+
+
+# ================= READ REPLICAS =================
+
+
+class ReplicaSettingsTest(SimpleTestCase):
+    def test_replica_aliases(self):
+        self.assertEqual(replica_settings(None, {}), {})
+
+        replicas = replica_settings(
+            "postgres://db-1/tasks, postgres://db-2/tasks,", {}
+        )
+        self.assertEqual(list(replicas), ["replica_1", "replica_2"])
+        self.assertEqual(replicas["replica_2"]["HOST"], "db-2")
+        self.assertEqual(replicas["replica_1"]["TEST"], {"MIRROR": "default"})
+
+    def test_router_reads_default_outside_replica_views(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Task))
+        self.assertEqual(router.db_for_write(Task), "default")
+
+
+@override_settings(DATABASE_READ_REPLICAS=["replica"])
+class ReadReplicaTest(TestCase):
+    databases = {"default", "replica"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="reader")
+        cls.status = Status.objects.create(name="New")
+        Task.objects.create(
+            name="Primary task", status=cls.status, author=cls.user
+        )
+
+        # Реплика «отстала»: в ней другая задача
+        with counters.suspended():
+            User.objects.using("replica").create(
+                pk=cls.user.pk, username="reader", password=cls.user.password
+            )
+            status = Status.objects.using("replica").create(
+                pk=cls.status.pk, name="New"
+            )
+            cls.replica_task = Task.objects.using("replica").create(
+                name="Replica task", status=status, author_id=cls.user.pk
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_list_pages_read_replica(self):
+        response = self.client.get(reverse("tasks_list"))
+        self.assertContains(response, "Replica task")
+        self.assertNotContains(response, "Primary task")
+
+        response = self.client.get(
+            reverse("task_detail", kwargs={"pk": self.replica_task.pk})
+        )
+        self.assertContains(response, "Replica task")
+
+        response = self.client.get(reverse("tasks_export"))
+        content = b"".join(response.streaming_content).decode()
+        self.assertIn("Replica task", content)
+        self.assertNotIn("Primary task", content)
+
+    def test_async_list_reads_replica(self):
+        response = self.client.get(reverse("tasks_list_async"))
+        self.assertContains(response, "Replica task")
+
+    def test_write_pins_reads_to_primary(self):
+        response = self.client.post(
+            reverse("task_create"),
+            {"name": "Created task", "status": self.status.pk},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertTrue(response.cookies[PIN_COOKIE]["httponly"])
+
+        response = self.client.get(reverse("tasks_list"))
+        self.assertContains(response, "Created task")
+        self.assertContains(response, "Primary task")
+        self.assertNotContains(response, "Replica task")
+
+    @override_settings(DATABASE_READ_REPLICAS=[])
+    def test_no_pin_without_replicas(self):
+        response = self.client.post(
+            reverse("task_create"),
+            {"name": "Created task", "status": self.status.pk},
+        )
+        self.assertNotIn(PIN_COOKIE, response.cookies)
@@ -0,0 +1,157 @@
+import json
+import logging
+import time
+import uuid
+from contextlib import ExitStack
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.db import connections
+
+logger = logging.getLogger("task_manager.timing")
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+class RequestTiming:
+    """Counters of one request, updated while the request runs."""
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.started = time.perf_counter()
+        self.finished = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.view_started = None
+        self.view_finished = None
+        self.render_finished = None
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+    @property
+    def total_time(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def view_time(self):
+        if self.view_started is None:
+            return None
+        # Для TemplateResponse рендеринг идет после view — считаем отдельно
+        end = self.view_finished or self.finished or time.perf_counter()
+        return end - self.view_started
+
+    @property
+    def render_time(self):
+        if self.view_finished is None or self.render_finished is None:
+            return None
+        return self.render_finished - self.view_finished
+
+    def as_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "queries": self.queries,
+            "db_ms": _ms(self.db_time),
+            "view_ms": _ms(self.view_time),
+            "render_ms": _ms(self.render_time),
+            "total_ms": _ms(self.total_time),
+        }
+
+    def server_timing(self):
+        metrics = [
+            f'db;dur={_ms(self.db_time)};desc="{self.queries} queries"',
+        ]
+        if self.view_time is not None:
+            metrics.append(f"view;dur={_ms(self.view_time)}")
+        if self.render_time is not None:
+            metrics.append(f"render;dur={_ms(self.render_time)}")
+        metrics.append(f"total;dur={_ms(self.total_time)}")
+        return ", ".join(metrics)
+
+
+class RequestTimingMiddleware:
+    """
+    Measure SQL, view and template time of every request.
+
+    The numbers go to the Server-Timing header and a JSON log line, and stay
+    on ``request.timing`` for error reporting.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timing = self.start(request)
+        with self.wrap_connections(timing):
+            response = self.get_response(request)
+        return self.finish(request, timing, response)
+
+    async def __acall__(self, request):
+        timing = self.start(request)
+        # Соединения у каждого потока свои: обертку ставим в том потоке,
+        # где sync_to_async выполняет ORM этого запроса
+        stack = await sync_to_async(self.wrap_connections)(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, timing, response)
+
+    def start(self, request):
+        request.timing = RequestTiming()
+        return request.timing
+
+    def wrap_connections(self, timing):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(
+                connections[alias].execute_wrapper(timing.execute_wrapper)
+            )
+        return stack
+
+    def finish(self, request, timing, response):
+        timing.finished = time.perf_counter()
+        response["Server-Timing"] = timing.server_timing()
+        response["X-Trace-Id"] = timing.trace_id
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    **timing.as_dict(),
+                }
+            )
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timing.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timing = request.timing
+        timing.view_finished = time.perf_counter()
+
+        def render_finished(response):
+            timing.render_finished = time.perf_counter()
+
+        response.add_post_render_callback(render_finished)
+        return response
@@ -6,3 +6,8 @@ class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "task_manager.users"
     verbose_name = _("Users")
+
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,39 @@
+"""
+Authentication backend that keeps session users in the cache.
+
+Django resolves ``request.user`` on every authenticated request by loading
+the user named in the session and checking the session auth hash against
+it. ``CachedModelBackend`` serves that lookup from the cache under
+``auth_user:<id>``; the hash check still runs on the cached object, so a
+changed password logs other sessions out as soon as the entry is dropped.
+Any save or delete of a user drops it (see ``users.signals``).
+"""
+
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+TIMEOUT = 60 * 15
+
+
+def user_cache_key(user_id):
+    return f"auth_user:{user_id}"
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, TIMEOUT)
+        return user
+
+
+def invalidate_user(sender, instance, **kwargs):
+    # Вход, смена пароля, правка или удаление профиля. Удаляем и после
+    # коммита: параллельный запрос мог успеть закешировать старую строку
+    key = user_cache_key(instance.pk)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
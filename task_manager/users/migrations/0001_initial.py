@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Profile",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="profile",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+                (
+                    "authored_tasks_count",
+                    models.IntegerField(default=0, editable=False),
+                ),
+                (
+                    "assigned_tasks_count",
+                    models.IntegerField(default=0, editable=False),
+                ),
+                (
+                    "open_assigned_tasks_count",
+                    models.IntegerField(default=0, editable=False),
+                ),
+            ],
+            options={
+                "verbose_name": "Profile",
+                "verbose_name_plural": "Profiles",
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.db import migrations
+
+# Индексы для istartswith, как в task_manager.prefix_search на момент миграции
+COLUMNS = ("username", "first_name", "last_name")
+
+CREATE_SQL = {
+    "sqlite": (
+        'CREATE INDEX IF NOT EXISTS "{name}" '
+        'ON "{table}" ("{column}" COLLATE NOCASE)'
+    ),
+    "postgresql": (
+        'CREATE INDEX IF NOT EXISTS "{name}" '
+        'ON "{table}" (UPPER("{column}"::text) text_pattern_ops)'
+    ),
+}
+
+
+def index_name(column):
+    return f"user_{column}_prefix_idx"
+
+
+def create_indexes(apps, schema_editor):
+    sql = CREATE_SQL.get(schema_editor.connection.vendor)
+    if not sql:
+        return
+    table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    for column in COLUMNS:
+        schema_editor.execute(
+            sql.format(name=index_name(column), table=table, column=column)
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor not in CREATE_SQL:
+        return
+    for column in COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{index_name(column)}"')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
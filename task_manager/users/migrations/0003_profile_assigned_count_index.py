@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_user_prefix_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(
+                fields=["-assigned_tasks_count"],
+                name="profile_assigned_count_idx",
+            ),
+        ),
+    ]
@@ -1 +1,31 @@
-# Create your models here.
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class Profile(models.Model):
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="profile",
+        verbose_name=_("User"),
+    )
+    # Поддерживаются task_manager.tasks.counters
+    authored_tasks_count = models.IntegerField(default=0, editable=False)
+    assigned_tasks_count = models.IntegerField(default=0, editable=False)
+    open_assigned_tasks_count = models.IntegerField(default=0, editable=False)
+
+    def __str__(self):
+        return str(self.user)
+
+    class Meta:
+        verbose_name = _("Profile")
+        verbose_name_plural = _("Profiles")
+        # Самые загруженные исполнители на главной странице
+        indexes = [
+            models.Index(
+                fields=["-assigned_tasks_count"],
+                name="profile_assigned_count_idx",
+            ),
+        ]
@@ -0,0 +1,30 @@
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+
+from task_manager.prefix_search import prefix_filter
+
+
+def search_filter(text):
+    """Prefix match on username, first or last name, or "first last"."""
+    words = text.split()
+    if not words:
+        return Q()
+    if len(words) == 1:
+        return prefix_filter(("username", "first_name", "last_name"), words[0])
+    # «Имя Фамилия» или «Фамилия Имя»
+    first, last = words[0], " ".join(words[1:])
+    return prefix_filter(("first_name",), first) & prefix_filter(
+        ("last_name",), last
+    ) | prefix_filter(("last_name",), first) & prefix_filter(
+        ("first_name",), last
+    )
+
+
+def with_task_counts(users):
+    # Счетчики Profile поддерживает task_manager.tasks.counters — те же
+    # числа, что на главной странице, одним JOIN по первичному ключу
+    return users.annotate(
+        authored_count=Coalesce("profile__authored_tasks_count", 0),
+        assigned_count=Coalesce("profile__assigned_tasks_count", 0),
+        open_assigned_count=Coalesce("profile__open_assigned_tasks_count", 0),
+    )
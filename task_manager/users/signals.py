@@ -0,0 +1,15 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+
+from .backends import invalidate_user
+
+User = get_user_model()
+
+
+def connect_signals():
+    for name, signal in (("save", post_save), ("delete", post_delete)):
+        signal.connect(
+            invalidate_user,
+            sender=User,
+            dispatch_uid=f"auth_user_cache_{name}",
+        )
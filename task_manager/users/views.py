@@ -6,13 +6,37 @@ from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager.pagination import KeysetPaginationMixin
+from task_manager.tasks.delete_impact import DeleteImpactMixin, user_impact
+
 from .forms import UserCreateForm, UserUpdateForm
+from .queries import search_filter, with_task_counts
 
 
-class UsersListView(ListView):
+class UsersListView(KeysetPaginationMixin, ListView):
     model = User
     template_name = "task_manager/users/users.html"
     context_object_name = "users"
+    paginate_by = 50
+    ordering = ("username",)
+    read_from_replica = True
+
+    def get_queryset(self):
+        users = User.objects.all()
+        search = self.request.GET.get("q", "").strip()
+        if search:
+            users = users.filter(search_filter(search))
+        if self.show_counts():
+            users = with_task_counts(users)
+        return users
+
+    def show_counts(self):
+        # Список открыт всем, а нагрузку по задачам видят только участники
+        return self.request.user.is_authenticated
+
+    def get_context_data(self, **kwargs):
+        kwargs.setdefault("show_counts", self.show_counts())
+        return super().get_context_data(**kwargs)
 
 
 class UserCreateView(CreateView):
@@ -50,7 +74,9 @@ class UserUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         return redirect("users_list")
 
 
-class UserDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class UserDeleteView(
+    LoginRequiredMixin, UserPassesTestMixin, DeleteImpactMixin, DeleteView
+):
     model = User
     template_name = "task_manager/users/delete.html"
     success_url = reverse_lazy("users_list")
@@ -63,6 +89,9 @@ class UserDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         messages.error(self.request, "У вас нет прав для изменения")
         return redirect("users_list")
 
+    def get_delete_impact(self):
+        return user_impact(self.object)
+
     def post(self, request, *args, **kwargs):
         try:
             response = super().post(request, *args, **kwargs)
@@ -8,10 +8,14 @@ from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
 from task_manager.labels.forms import LabelForm
 from task_manager.labels.models import Label
+from task_manager.tasks.dashboard import dashboard
 
 
 def index(request):
-    return render(request, "task_manager/index.html")
+    context = {}
+    if request.user.is_authenticated:
+        context["dashboard"] = dashboard()
+    return render(request, "task_manager/index.html", context)
 
 
 class LoginView(auth_views.LoginView):